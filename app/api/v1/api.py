@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import wallets
+from app.api.v1.endpoints import clusters, wallets
 
 api_router = APIRouter()
 
-api_router.include_router(wallets.router, prefix="/wallets", tags=["wallets"]) 
\ No newline at end of file
+api_router.include_router(wallets.router, prefix="/wallets", tags=["wallets"])
+api_router.include_router(clusters.router, prefix="/clusters", tags=["clusters"])
\ No newline at end of file
@@ -0,0 +1,71 @@
+# app/api/v1/endpoints/clusters.py
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+import logging
+from app.core.database import get_db
+from app.schemas.cluster import ClusterDetail, ClusterPage
+from app.services.cluster_service import ClusterService
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+cluster_service = ClusterService()
+
+
+@router.get("", response_model=ClusterPage)
+def list_clusters(
+    cluster_type: Optional[str] = Query(default=None, pattern="^(BUY_CLUSTER|SELL_CLUSTER)$", description="Filter by cluster type"),
+    token: Optional[str] = Query(default=None, description="Funding token mint/symbol or target token mint"),
+    parent_wallet: Optional[str] = Query(default=None, description="Filter by parent wallet address"),
+    start_time: Optional[datetime] = Query(default=None, description="Earliest formation time (inclusive)"),
+    end_time: Optional[datetime] = Query(default=None, description="Latest formation time (inclusive)"),
+    min_children: Optional[int] = Query(default=None, ge=0, description="Minimum number of funded children"),
+    min_completion_rate: Optional[float] = Query(default=None, ge=0, le=100, description="Minimum swap completion rate (0-100)"),
+    sort_by: str = Query(default="formation_time", pattern="^(formation_time|total_amount_sent|children_funded|swap_completion_rate)$", description="Sort column"),
+    order: str = Query(default="desc", pattern="^(asc|desc)$", description="Sort direction"),
+    cursor: Optional[str] = Query(default=None, description="Cursor returned as next_cursor by the previous page"),
+    limit: int = Query(default=50, ge=1, le=500, description="Page size (1-500)"),
+    db: Session = Depends(get_db),
+) -> ClusterPage:
+    """
+    List persisted clusters for the dashboard table view.
+
+    Returns summary rows only; use the detail endpoint to load a cluster's
+    children. Pagination is keyset based: pass the returned next_cursor to
+    fetch the following page with the same filters and sort.
+    """
+    try:
+        items, next_cursor = cluster_service.list_clusters(
+            db,
+            cluster_type=cluster_type,
+            token=token,
+            parent_wallet=parent_wallet,
+            start_time=start_time,
+            end_time=end_time,
+            min_children=min_children,
+            min_completion_rate=min_completion_rate,
+            sort_by=sort_by,
+            order=order,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ClusterPage(items=items, limit=limit, next_cursor=next_cursor)
+
+
+@router.get("/{cluster_id}", response_model=ClusterDetail)
+def get_cluster(
+    cluster_id: str = Path(..., description="Cluster identifier"),
+    db: Session = Depends(get_db),
+) -> ClusterDetail:
+    """
+    Get a persisted cluster including its child wallets and target tokens.
+    """
+    cluster = cluster_service.get_cluster(db, cluster_id)
+    if cluster is None:
+        raise HTTPException(status_code=404, detail=f"Cluster not found: {cluster_id}")
+    return cluster
@@ -1,7 +1,11 @@
 # app/api/v1/endpoints/wallets.py
-from fastapi import APIRouter, HTTPException, Path, Query
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List, Optional, Set
 import logging
+from app.core.database import get_db
+from app.core.http_cache import compute_etag, etag_matches, not_modified
+from app.services.cluster_service import ClusterService
 from app.services.helius_service import HeliusService
 
 # Set up logging
@@ -9,29 +13,114 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 helius_service = HeliusService()
+cluster_service = ClusterService()
+
+CLUSTER_DETECTION_SECTIONS = {"detection_params", "summary", "clusters"}
+
+# Nested collections of a Helius transaction, dropped with include_children=false
+TRANSACTION_CHILD_FIELDS = {"tokenTransfers", "nativeTransfers", "accountData", "instructions", "events"}
+
+
+def _parse_fields(fields: Optional[str], allowed: Optional[Set[str]] = None) -> Optional[Set[str]]:
+    """
+    Parse a comma separated fields= parameter. None means all fields.
+    """
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    if allowed is not None and not requested <= allowed:
+        unknown = ", ".join(sorted(requested - allowed))
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {unknown}. Allowed: {', '.join(sorted(allowed))}")
+    return requested
+
+
+def _project_transaction(txn: Dict[str, Any], fields: Optional[Set[str]], include_children: bool) -> Dict[str, Any]:
+    return {
+        key: value
+        for key, value in txn.items()
+        if (fields is None or key in fields) and (include_children or key not in TRANSACTION_CHILD_FIELDS)
+    }
+
+
+def _signatures(transactions: List[Dict[str, Any]]) -> List[Optional[str]]:
+    return [txn.get("signature") for txn in transactions]
+
+
+def _detect_clusters_response(
+    db: Session,
+    transactions: List[Dict[str, Any]],
+    min_children: int,
+    funding_window: int,
+    sections: Set[str],
+    include_children: bool,
+) -> Dict[str, Any]:
+    """
+    Run detection, persist the clusters and return the requested sections.
+
+    Per-child breakdowns are only built when clusters are requested with
+    include_children, plus for clusters not persisted yet so that their
+    stored rows are complete. Clusters already stored keep their children.
+    """
+    build_children = include_children and "clusters" in sections
+    cluster_analysis = helius_service.detect_wallet_clusters(
+        transactions,
+        min_children,
+        funding_window,
+        build_children or (lambda cluster_id: not cluster_service.cluster_exists(db, cluster_id)),
+    )
+    cluster_service.save_clusters(db, cluster_analysis["clusters"])
+
+    if "clusters" in sections and not build_children:
+        cluster_analysis["clusters"] = [
+            {key: value for key, value in cluster.items() if key != "children"}
+            for cluster in cluster_analysis["clusters"]
+        ]
+    return {section: value for section, value in cluster_analysis.items() if section in sections}
 
 
 @router.get("/raw-transactions/{wallet_address}")
 async def get_raw_transactions(
+    request: Request,
+    response: Response,
     wallet_address: str = Path(..., description="Solana wallet address"),
+    fields: Optional[str] = Query(default=None, description="Comma separated transaction fields to return (default: all)"),
+    include_children: bool = Query(default=True, description="Include nested transfers, account data, instructions and events"),
 ) -> Dict[str, Any]:
     """
     Get raw transactions for a specific Solana wallet address.
     
     Args:
         wallet_address: The Solana wallet address to fetch transactions for
+        fields: Only return these top-level transaction fields
+        include_children: Include nested collections (tokenTransfers, nativeTransfers, ...)
     
     Returns:
-        Any response format - completely flexible
+        Any response format - completely flexible. Answers 304 when
+        If-None-Match matches the ETag of an unchanged result.
     """
+    requested_fields = _parse_fields(fields)
     try:
         logger.info(f"Fetching raw transactions for wallet: {wallet_address}")
     
         # # Call the Helius service to get raw transactions
         transactions = await helius_service.get_raw_transactions(wallet_address, 300)
+
+        etag = compute_etag(
+            "raw-transactions", wallet_address, _signatures(transactions),
+            sorted(requested_fields or []), include_children
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
     
         # Return the response using the schema
-        return {"transactions": transactions}
+        if requested_fields is None and include_children:
+            return {"transactions": transactions}
+        return {
+            "transactions": [
+                _project_transaction(txn, requested_fields, include_children) for txn in transactions
+            ]
+        }
         
     except Exception as e:
         logger.error(f"Error fetching raw transactions for wallet {wallet_address}: {str(e)}")
@@ -43,9 +132,14 @@ async def get_raw_transactions(
 
 @router.get("/cluster-detection/{wallet_address}")
 async def get_cluster_detection(
+    request: Request,
+    response: Response,
     wallet_address: str = Path(..., description="Solana wallet address"),
     min_children: int = Query(default=5, ge=3, le=20, description="Minimum children required for cluster (3-20)"),
-    funding_window: int = Query(default=5, ge=1, le=30, description="Funding window in minutes for cluster formation (1-30)")
+    funding_window: int = Query(default=5, ge=1, le=30, description="Funding window in minutes for cluster formation (1-30)"),
+    fields: Optional[str] = Query(default=None, description="Comma separated sections: detection_params, summary, clusters (default: all)"),
+    include_children: bool = Query(default=True, description="Include the per-child breakdown of each cluster"),
+    db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     """
     Detect wallet clusters where a parent wallet funds multiple child wallets
@@ -56,13 +150,64 @@ async def get_cluster_detection(
     - Child wallets may perform swaps (tracked but no time constraint)
     - Clusters classified as BUY_CLUSTER (SOL funding) or SELL_CLUSTER (token funding)
     - Coordination detection (all children targeting same token)
+
+    Detected clusters are persisted so they can be listed via /clusters.
+    Use fields= and include_children= to limit the response; unchanged
+    results answer If-None-Match with 304.
     """
+    sections = _parse_fields(fields, CLUSTER_DETECTION_SECTIONS) or CLUSTER_DETECTION_SECTIONS
     try:
         logger.info(f"Detecting wallet clusters for: {wallet_address}, min_children: {min_children}, window: {funding_window}min")
         transactions = await helius_service.get_raw_transactions(wallet_address, 100)
-        cluster_analysis = helius_service.detect_wallet_clusters(transactions, min_children, funding_window)
-        return cluster_analysis
+
+        etag = compute_etag(
+            "cluster-detection", wallet_address, _signatures(transactions),
+            min_children, funding_window, sorted(sections), include_children
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+
+        return _detect_clusters_response(db, transactions, min_children, funding_window, sections, include_children)
     except Exception as e:
         logger.error(f"Error detecting wallet clusters for {wallet_address}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to detect wallet clusters: {str(e)}")
 
+
+@router.get("/cluster-detection")
+async def get_batch_cluster_detection(
+    request: Request,
+    response: Response,
+    wallets: List[str] = Query(default=[], description="Solana wallet addresses to scan together (1-50)"),
+    min_children: int = Query(default=5, ge=3, le=20, description="Minimum children required for cluster (3-20)"),
+    funding_window: int = Query(default=5, ge=1, le=30, description="Funding window in minutes for cluster formation (1-30)"),
+    fields: Optional[str] = Query(default=None, description="Comma separated sections: detection_params, summary, clusters (default: all)"),
+    include_children: bool = Query(default=True, description="Include the per-child breakdown of each cluster"),
+    db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Detect wallet clusters across several related wallets in one scan.
+
+    Transactions appearing in more than one wallet's history are analyzed
+    once, so shared funding events are not counted twice. Detected clusters
+    are persisted like those of the single-wallet endpoint.
+    """
+    if not 1 <= len(wallets) <= 50:
+        raise HTTPException(status_code=400, detail="Provide between 1 and 50 wallets")
+    sections = _parse_fields(fields, CLUSTER_DETECTION_SECTIONS) or CLUSTER_DETECTION_SECTIONS
+    try:
+        logger.info(f"Detecting wallet clusters for {len(wallets)} wallets, min_children: {min_children}, window: {funding_window}min")
+        transactions = await helius_service.get_transactions_for_wallets(wallets, 100)
+
+        etag = compute_etag(
+            "cluster-detection", wallets, _signatures(transactions),
+            min_children, funding_window, sorted(sections), include_children
+        )
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+
+        return _detect_clusters_response(db, transactions, min_children, funding_window, sections, include_children)
+    except Exception as e:
+        logger.error(f"Error detecting wallet clusters for {wallets}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to detect wallet clusters: {str(e)}")
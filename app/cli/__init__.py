@@ -0,0 +1 @@
+# Command line tools
\ No newline at end of file
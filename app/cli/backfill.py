@@ -0,0 +1,135 @@
+# app/cli/backfill.py
+"""
+Backfill wallet history from Helius into the local transaction store.
+
+Usage:
+    python -m app.cli.backfill WALLET [WALLET ...] [options]
+    python -m app.cli.backfill --file watchlist.txt --days 90 --concurrency 8
+
+Progress is checkpointed per wallet after every page; rerunning the same
+command resumes interrupted wallets, fetches only transactions newer than
+those already stored, and goes further back when --days is increased. Once
+all wallets are stored, cluster detection runs over the backfilled
+transactions and the clusters are persisted like those found by the API.
+Detection is skipped when any wallet failed, since its history is partial.
+
+Pass --standin with a recorded transaction file to run without the real
+API, or point --base-url at another Helius-compatible server.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.services.backfill_service import MAX_PAGE_SIZE, BackfillService
+from app.services.cluster_service import ClusterService
+from app.services.helius_service import HeliusService
+from app.services.helius_standin import HeliusStandIn
+from app.services.transaction_store import TransactionStore
+
+logger = logging.getLogger(__name__)
+
+
+def read_wallets(args: argparse.Namespace) -> List[str]:
+    wallets = list(args.wallets)
+    if args.file:
+        with open(args.file) as f:
+            wallets.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(wallets))
+
+
+def bounded_int(minimum: int, maximum: Optional[int] = None):
+    """
+    argparse type for an int within [minimum, maximum].
+    """
+    def parse(value: str) -> int:
+        number = int(value)
+        if number < minimum or (maximum is not None and number > maximum):
+            limit = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+            raise argparse.ArgumentTypeError(f"must be {limit}, got {number}")
+        return number
+    return parse
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill Helius wallet history and run cluster detection")
+    parser.add_argument("wallets", nargs="*", help="Wallet addresses to backfill")
+    parser.add_argument("--file", help="File with one wallet address per line")
+    parser.add_argument("--days", type=int, default=None, help="Only backfill the last N days (default: full history)")
+    parser.add_argument("--concurrency", type=bounded_int(1), default=4, help="Wallets fetched in parallel (default: 4)")
+    parser.add_argument("--page-size", type=bounded_int(1, MAX_PAGE_SIZE), default=MAX_PAGE_SIZE,
+                        help=f"Transactions per Helius request, 1-{MAX_PAGE_SIZE} (default: {MAX_PAGE_SIZE})")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoints and start from the newest page")
+    parser.add_argument("--base-url", default=None, help="Helius API base URL (default: HELIUS_BASE_URL)")
+    parser.add_argument("--api-key", default=None, help="Helius API key (default: HELIUS_API_KEY)")
+    parser.add_argument("--standin", default=None, help="Serve Helius requests from this recorded transaction file")
+    parser.add_argument("--min-children", type=int, default=settings.MIN_CHILD_WALLETS, help="Minimum children for a cluster")
+    parser.add_argument("--funding-window", type=int, default=settings.DETECTION_WINDOW_MINUTES, help="Funding window in minutes")
+    parser.add_argument("--skip-detection", action="store_true", help="Only backfill, do not run cluster detection")
+    parser.add_argument("--verbose", action="store_true", help="Also log SQL statements")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    wallets = read_wallets(args)
+    if not wallets:
+        raise SystemExit("No wallets given; pass addresses or --file")
+
+    Base.metadata.create_all(bind=engine)
+
+    transport = HeliusStandIn.from_file(args.standin).transport() if args.standin else None
+    helius_service = HeliusService(api_key=args.api_key, base_url=args.base_url, transport=transport)
+    store = TransactionStore()
+    since = datetime.now() - timedelta(days=args.days) if args.days else None
+
+    logger.info(f"Backfilling {len(wallets)} wallets with concurrency {args.concurrency}")
+    backfill = BackfillService(
+        helius_service=helius_service,
+        store=store,
+        concurrency=args.concurrency,
+        page_size=args.page_size,
+        since=since,
+    )
+    report = await backfill.run(wallets, restart=args.restart)
+    logger.info(f"Backfill finished: {report['transactions_fetched']} transactions in "
+                f"{report['elapsed_seconds']}s ({report['transactions_per_second']} tx/s)")
+
+    if report["wallets_failed"] and not args.skip_detection:
+        logger.warning(f"Skipping cluster detection: {len(report['wallets_failed'])} wallets failed to backfill "
+                       f"and their history is incomplete; rerun to resume them")
+    elif not args.skip_detection:
+        db = SessionLocal()
+        try:
+            transactions = store.load_transactions(
+                db, wallets, start_timestamp=int(since.timestamp()) if since else None
+            )
+            cluster_analysis = helius_service.detect_wallet_clusters(
+                transactions, args.min_children, args.funding_window, use_cache=False
+            )
+            ClusterService().save_clusters(db, cluster_analysis["clusters"])
+        finally:
+            db.close()
+        report["detection"] = {
+            "transactions_analyzed": cluster_analysis["detection_params"]["total_transactions_analyzed"],
+            **cluster_analysis["summary"],
+        }
+
+    return report
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    engine.echo = args.verbose
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if report["wallets_failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# app/cli/sweep.py
+"""
+Replay a recorded transaction set across a grid of detection parameters.
+
+Usage:
+    python -m app.cli.sweep --fixture app/reponse.json
+    python -m app.cli.sweep --store --wallet WalletA --wallet WalletB --format csv
+    python -m app.cli.sweep --fixture recording.json --min-children 3:10 --funding-window 1,5,10
+
+The recording is loaded and indexed once, then every (min_children,
+funding_window) combination is evaluated across a process pool. Prints the
+clusters found per combination.
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+from typing import List
+
+from app.core.database import engine
+from app.services.replay_service import FUNDING_WINDOW_RANGE, MIN_CHILDREN_RANGE, ReplayService
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    "min_children",
+    "funding_window_minutes",
+    "clusters_found",
+    "buy_clusters",
+    "sell_clusters",
+    "total_children",
+    "total_children_swapped",
+]
+
+
+def parse_values(spec: str) -> List[int]:
+    """
+    Parse "3:20" (inclusive range) or "1,5,10" into a list of ints.
+    """
+    if ":" in spec:
+        start, end = spec.split(":", 1)
+        return list(range(int(start), int(end) + 1))
+    return [int(value) for value in spec.split(",") if value]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sweep cluster detection parameters over a recorded transaction set")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixture", help="JSON file with recorded Helius transactions")
+    source.add_argument("--store", action="store_true", help="Replay transactions from the local transaction store")
+    parser.add_argument("--wallet", action="append", default=None, help="With --store, only these wallets' histories (repeatable)")
+    parser.add_argument("--min-children", type=parse_values, default=MIN_CHILDREN_RANGE, help="Values as 'start:end' or 'a,b,c' (default: 3:20)")
+    parser.add_argument("--funding-window", type=parse_values, default=FUNDING_WINDOW_RANGE, help="Minutes as 'start:end' or 'a,b,c' (default: 1:30)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 1 = in-process)")
+    parser.add_argument("--format", choices=["table", "csv", "json"], default="table", help="Output format (default: table)")
+    return parser.parse_args(argv)
+
+
+def write_rows(rows: List[dict], output_format: str, out=sys.stdout) -> None:
+    if output_format == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+    elif output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        widths = [max(len(column), 6) for column in COLUMNS]
+        out.write("  ".join(column.rjust(width) for column, width in zip(COLUMNS, widths)) + "\n")
+        for row in rows:
+            out.write("  ".join(str(row[column]).rjust(width) for column, width in zip(COLUMNS, widths)) + "\n")
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    engine.echo = False
+
+    replay = ReplayService()
+    if args.fixture:
+        replay.load_fixture(args.fixture)
+    else:
+        replay.load_store(args.wallet)
+
+    rows = replay.sweep(args.min_children, args.funding_window, workers=args.workers)
+    write_rows(rows, args.format)
+
+
+if __name__ == "__main__":
+    main()
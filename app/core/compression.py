@@ -0,0 +1,108 @@
+# app/core/compression.py
+import gzip
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header, honouring q=0.
+    Brotli is preferred when the client accepts it and the package is installed.
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    def allowed(name: str) -> bool:
+        return accepted.get(name, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with brotli or gzip once they reach minimum_size.
+
+    The whole body is buffered before compressing, which suits the JSON
+    responses of this API. Streaming responses (more than one body chunk)
+    are passed through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        streaming = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, streaming
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or streaming:
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                streaming = True
+                await send(start_message)
+                await send(message)
+                return
+
+            await self._send_body(send, start_message, message.get("body", b""), encoding)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _send_body(self, send: Send, start_message: Message, body: bytes, encoding: str) -> None:
+        headers = MutableHeaders(raw=start_message["headers"])
+        if (
+            len(body) < self.minimum_size
+            or start_message["status"] in (204, 304)
+            or "content-encoding" in headers
+        ):
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        if encoding == "br":
+            body = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            body = gzip.compress(body, compresslevel=self.gzip_level)
+
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        await send(start_message)
+        await send({"type": "http.response.body", "body": body})
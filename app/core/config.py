@@ -20,6 +20,16 @@ class Settings(BaseSettings):
     # Detection Settings
     MIN_CHILD_WALLETS: int = 5  # Minimum child wallets to trigger parent detection
     DETECTION_WINDOW_MINUTES: int = 5  # Time window for parent-child detection
+    PARSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Memory budget for parsed transactions shared across scans
+
+    # Polling
+    WATCHED_WALLETS: List[str] = []  # Wallets polled in the background (JSON list in .env)
+    POLL_INTERVAL_SECONDS: int = 15  # Delay between polling rounds
+    LEASE_BACKEND: str = "database"  # "database" (shared across workers) or "memory" (single process)
+    LEASE_TTL_SECONDS: int = 45  # Lease lifetime; a dead worker's wallets are taken over after this
+    
+    # Responses
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Bytes; smaller responses are sent uncompressed
     
     # Environment
     ENVIRONMENT: str = "development"
@@ -1,18 +1,34 @@
+import asyncio
+import logging
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
 from app.api.v1.api import api_router
 from app.core.database import engine, Base
+from app.services.polling_service import WalletPoller
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     Base.metadata.create_all(bind=engine)
+    poller_task = None
+    if settings.WATCHED_WALLETS:
+        poller_task = asyncio.create_task(WalletPoller().run())
     yield
     # Shutdown
-    pass
+    if poller_task:
+        poller_task.cancel()
+        try:
+            await poller_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Wallet poller stopped with an error: {str(e)}")
 
 
 def create_application() -> FastAPI:
@@ -24,6 +40,8 @@ def create_application() -> FastAPI:
         lifespan=lifespan,
     )
 
+    application.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
     # Include API router
     application.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class Cluster(Base):
+    __tablename__ = "clusters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cluster_id = Column(String, unique=True, index=True, nullable=False)
+    parent_wallet = Column(String, index=True, nullable=False)
+    cluster_type = Column(String, nullable=False)
+    formation_time = Column(DateTime, nullable=False)
+    formation_window = Column(String)
+
+    funding_token = Column(String, index=True)
+    funding_token_symbol = Column(String)
+    children_funded = Column(Integer, default=0)
+    total_amount_sent = Column(Float, default=0.0)
+
+    children_swapped = Column(Integer, default=0)
+    total_amount_swapped = Column(Float, default=0.0)
+    swap_completion_rate = Column(Float, default=0.0)  # 0-100
+    coordinated_target = Column(Boolean, default=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    children = relationship(
+        "ClusterChild", back_populates="cluster", cascade="all, delete-orphan", lazy="select"
+    )
+    target_tokens = relationship(
+        "ClusterTargetToken", back_populates="cluster", cascade="all, delete-orphan", lazy="select"
+    )
+
+    # Keyset pagination orders by (sort column, id), so every sortable column
+    # gets a composite index with the primary key as tie-breaker.
+    __table_args__ = (
+        Index("ix_clusters_formation_time_id", "formation_time", "id"),
+        Index("ix_clusters_total_amount_sent_id", "total_amount_sent", "id"),
+        Index("ix_clusters_children_funded_id", "children_funded", "id"),
+        Index("ix_clusters_swap_completion_rate_id", "swap_completion_rate", "id"),
+    )
+
+
+class ClusterChild(Base):
+    __tablename__ = "cluster_children"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cluster_pk = Column(Integer, ForeignKey("clusters.id", ondelete="CASCADE"), index=True, nullable=False)
+    wallet = Column(String, index=True, nullable=False)
+    funded_amount = Column(Float, default=0.0)
+    swap_status = Column(String, default="pending")
+    swap_amount = Column(Float, default=0.0)
+    swap_time = Column(DateTime, nullable=True)
+    target_tokens = Column(String, default="")  # comma separated mints
+
+    cluster = relationship("Cluster", back_populates="children")
+
+
+class ClusterTargetToken(Base):
+    __tablename__ = "cluster_target_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cluster_pk = Column(Integer, ForeignKey("clusters.id", ondelete="CASCADE"), nullable=False)
+    mint = Column(String, nullable=False)
+
+    cluster = relationship("Cluster", back_populates="target_tokens")
+
+    __table_args__ = (
+        Index("ix_cluster_target_tokens_mint_cluster", "mint", "cluster_pk"),
+    )
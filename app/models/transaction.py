@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, Integer, Text, DateTime, Boolean, ForeignKey, Index
+from app.core.database import Base
+
+
+class StoredTransaction(Base):
+    __tablename__ = "transactions"
+
+    signature = Column(String, primary_key=True)
+    timestamp = Column(Integer, index=True, nullable=False)
+    slot = Column(Integer)
+    payload = Column(Text, nullable=False)  # Raw Helius transaction JSON
+
+
+class WalletTransaction(Base):
+    __tablename__ = "wallet_transactions"
+
+    wallet_address = Column(String, primary_key=True)
+    signature = Column(String, ForeignKey("transactions.signature"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_wallet_transactions_signature", "signature"),
+    )
+
+
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+
+    wallet_address = Column(String, primary_key=True)
+    last_signature = Column(String, nullable=True)  # Oldest signature fetched so far
+    newest_signature = Column(String, nullable=True)  # Newest signature fetched so far
+    transactions_fetched = Column(Integer, default=0)
+    pages_fetched = Column(Integer, default=0)
+    completed = Column(Boolean, default=False)  # Reached the start of the wallet's history
+    covered_since = Column(Integer, nullable=True)  # Earliest --days cutoff reached (unix timestamp)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, DateTime
+from app.core.database import Base
+
+
+class WalletLease(Base):
+    __tablename__ = "wallet_leases"
+
+    wallet_address = Column(String, primary_key=True)
+    owner_id = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    acquired_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,44 @@
+# app/schemas/cluster.py
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import datetime
+
+
+class ClusterSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    cluster_id: str
+    parent_wallet: str
+    cluster_type: str
+    formation_time: datetime
+    funding_token: Optional[str] = None
+    funding_token_symbol: Optional[str] = None
+    children_funded: int
+    children_swapped: int
+    total_amount_sent: float
+    total_amount_swapped: float
+    swap_completion_rate: float
+    coordinated_target: bool
+
+
+class ClusterChildDetail(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    wallet: str
+    funded_amount: float
+    swap_status: str
+    swap_amount: float
+    swap_time: Optional[datetime] = None
+    target_tokens: List[str] = []
+
+
+class ClusterDetail(ClusterSummary):
+    formation_window: Optional[str] = None
+    target_tokens: List[str] = []
+    children: List[ClusterChildDetail] = []
+
+
+class ClusterPage(BaseModel):
+    items: List[ClusterSummary]
+    limit: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,234 @@
+# app/services/backfill_service.py
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.transaction import BackfillCheckpoint
+from app.services.helius_service import HeliusService
+from app.services.transaction_store import TransactionStore
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Helius returns at most this many transactions per request. A larger page
+# size would make every full page look like the end of history.
+MAX_PAGE_SIZE = 100
+
+
+class BackfillService:
+    """
+    Pages backwards through Helius history for a list of wallets and stores
+    every transaction in the local TransactionStore.
+
+    Up to `concurrency` wallets are fetched at once. After each page the
+    oldest and newest signatures seen are checkpointed, so rerunning after an
+    interruption continues from where each wallet stopped. On a rerun, newer
+    transactions are fetched first (paging back until the newest stored
+    signature), then older history continues unless the wallet already
+    reached the start of its history or an earlier-or-equal since cutoff.
+    """
+
+    def __init__(
+        self,
+        helius_service: Optional[HeliusService] = None,
+        store: Optional[TransactionStore] = None,
+        session_factory=SessionLocal,
+        concurrency: int = 4,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
+        max_retries: int = 3,
+    ):
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}, got {page_size}")
+
+        self.helius_service = helius_service or HeliusService()
+        self.store = store or TransactionStore()
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.since_timestamp = int(since.timestamp()) if since else None
+        self.max_retries = max_retries
+        self.retry_delay = 1.0  # Seconds before the first retry, doubled on each attempt
+
+        self._started_at = 0.0
+        self._transactions_fetched = 0
+        self._pages_fetched = 0
+        self._wallets_done = 0
+        self._wallets_total = 0
+
+    async def run(self, wallet_addresses: List[str], restart: bool = False) -> Dict[str, Any]:
+        """
+        Backfill all wallets and return run statistics.
+        """
+        if restart:
+            db = self.session_factory()
+            try:
+                for wallet_address in wallet_addresses:
+                    self.store.reset_checkpoint(db, wallet_address)
+            finally:
+                db.close()
+
+        self._started_at = time.monotonic()
+        self._wallets_total = len(wallet_addresses)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(wallet_address: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.backfill_wallet(wallet_address)
+
+        results = await asyncio.gather(
+            *(bounded(wallet_address) for wallet_address in wallet_addresses),
+            return_exceptions=True,
+        )
+
+        failed = {}
+        for wallet_address, result in zip(wallet_addresses, results):
+            if isinstance(result, Exception):
+                logger.error(f"Backfill failed for {wallet_address}: {str(result)}")
+                failed[wallet_address] = str(result)
+
+        elapsed = time.monotonic() - self._started_at
+        return {
+            "wallets": len(wallet_addresses),
+            "wallets_failed": failed,
+            "transactions_fetched": self._transactions_fetched,
+            "pages_fetched": self._pages_fetched,
+            "elapsed_seconds": round(elapsed, 2),
+            "transactions_per_second": round(self._transactions_fetched / elapsed, 1) if elapsed else 0.0,
+        }
+
+    async def backfill_wallet(self, wallet_address: str) -> Dict[str, Any]:
+        """
+        Backfill one wallet, resuming from its checkpoint.
+        """
+        db = self.session_factory()
+        try:
+            checkpoint = self.store.get_checkpoint(db, wallet_address)
+            resumed = checkpoint is not None
+            fetched = 0
+
+            if checkpoint and checkpoint.newest_signature:
+                fetched += await self._fetch_newer(db, wallet_address, checkpoint.newest_signature)
+
+            if self._needs_older(checkpoint):
+                before = checkpoint.last_signature if checkpoint else None
+                if before:
+                    logger.info(f"[{wallet_address}] resuming before {before}")
+                fetched += await self._fetch_older(db, wallet_address, before)
+            else:
+                logger.info(f"[{wallet_address}] older history already stored")
+
+            checkpoint = self.store.get_checkpoint(db, wallet_address)
+            self._wallets_done += 1
+            logger.info(f"[{wallet_address}] done: {checkpoint.transactions_fetched} transactions stored "
+                        f"({self._wallets_done}/{self._wallets_total} wallets)")
+            return {"wallet": wallet_address, "transactions": fetched, "resumed": resumed}
+        finally:
+            db.close()
+
+    def _needs_older(self, checkpoint: Optional[BackfillCheckpoint]) -> bool:
+        if checkpoint is None:
+            return True
+        if checkpoint.completed:
+            return False
+        # A previous run already reached this cutoff (or an earlier one)
+        return not (
+            self.since_timestamp is not None
+            and checkpoint.covered_since is not None
+            and self.since_timestamp >= checkpoint.covered_since
+        )
+
+    async def _fetch_older(self, db: Session, wallet_address: str, before: Optional[str]) -> int:
+        """
+        Page backwards from `before` until the start of history or the since cutoff.
+        """
+        fetched = 0
+        while True:
+            page = await self._fetch_page(wallet_address, before)
+            reached_since = bool(
+                page and self.since_timestamp is not None and page[-1]["timestamp"] < self.since_timestamp
+            )
+            if reached_since:
+                page = [txn for txn in page if txn["timestamp"] >= self.since_timestamp]
+            completed = not reached_since and len(page) < self.page_size
+
+            checkpoint = self.store.save_page(
+                db, wallet_address, page,
+                completed=completed,
+                covered_since=self.since_timestamp if reached_since else None,
+            )
+            fetched += len(page)
+            self._record_page(wallet_address, len(page), checkpoint.transactions_fetched)
+
+            if completed or reached_since:
+                return fetched
+            before = checkpoint.last_signature
+
+    async def _fetch_newer(self, db: Session, wallet_address: str, until: str) -> int:
+        """
+        Fetch transactions newer than the newest stored signature.
+
+        The newest signature only moves once the gap is filled, so an
+        interrupted catch-up is simply repeated on the next run.
+        """
+        fetched = 0
+        before = None
+        newest = None
+        while True:
+            page = await self._fetch_page(wallet_address, before, until=until)
+            if page and newest is None:
+                newest = page[0]["signature"]
+            caught_up = len(page) < self.page_size
+
+            checkpoint = self.store.save_page(
+                db, wallet_address, page,
+                backward=False,
+                newest_signature=newest if caught_up else None,
+            )
+            fetched += len(page)
+            self._record_page(wallet_address, len(page), checkpoint.transactions_fetched)
+
+            if caught_up:
+                return fetched
+            before = page[-1]["signature"]
+
+    async def _fetch_page(
+        self, wallet_address: str, before: Optional[str], until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one page, retrying rate limits and transient server errors with backoff.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.helius_service.get_raw_transactions(
+                    wallet_address, self.page_size, before=before, until=until
+                )
+            except httpx.HTTPStatusError as http_err:
+                if http_err.response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    raise
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            delay = self.retry_delay * 2 ** attempt
+            logger.info(f"[{wallet_address}] retrying page in {delay}s (attempt {attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+        return []
+
+    def _record_page(self, wallet_address: str, page_count: int, wallet_total: int) -> None:
+        self._pages_fetched += 1
+        self._transactions_fetched += page_count
+        elapsed = time.monotonic() - self._started_at
+        rate = self._transactions_fetched / elapsed if elapsed else 0.0
+        logger.info(f"[{wallet_address}] +{page_count} (wallet total {wallet_total}) | "
+                    f"{self._transactions_fetched} transactions, {self._pages_fetched} pages, "
+                    f"{rate:.1f} tx/s overall")
+
@@ -0,0 +1,264 @@
+# app/services/cluster_service.py
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.cluster import Cluster, ClusterChild, ClusterTargetToken
+
+logger = logging.getLogger(__name__)
+
+# Columns the listing endpoint may sort on. Each one is backed by a
+# (column, id) composite index on the clusters table.
+SORTABLE_COLUMNS = {
+    "formation_time": Cluster.formation_time,
+    "total_amount_sent": Cluster.total_amount_sent,
+    "children_funded": Cluster.children_funded,
+    "swap_completion_rate": Cluster.swap_completion_rate,
+}
+
+# Attempts before giving up when concurrent writers keep inserting the same
+# cluster_ids between our select and commit.
+SAVE_ATTEMPTS = 3
+
+# Lightweight projection used by the listing endpoint; children and target
+# tokens are only loaded by the detail endpoint.
+SUMMARY_COLUMNS = (
+    Cluster.id,
+    Cluster.cluster_id,
+    Cluster.parent_wallet,
+    Cluster.cluster_type,
+    Cluster.formation_time,
+    Cluster.funding_token,
+    Cluster.funding_token_symbol,
+    Cluster.children_funded,
+    Cluster.children_swapped,
+    Cluster.total_amount_sent,
+    Cluster.total_amount_swapped,
+    Cluster.swap_completion_rate,
+    Cluster.coordinated_target,
+)
+
+
+class ClusterService:
+    def save_clusters(self, db: Session, clusters: List[Dict[str, Any]]) -> int:
+        """
+        Persist clusters produced by HeliusService.detect_wallet_clusters.
+
+        Clusters are upserted on cluster_id, so re-running detection over the
+        same wallet refreshes swap progress instead of creating duplicates.
+        A cluster passed without "children" (detected for a projected
+        response) keeps the children already stored for it.
+        If another writer inserts one of the same clusters first, the unique
+        cluster_id constraint fails the commit; the batch is then rolled back
+        and retried as an update of the rows that now exist.
+
+        Returns:
+            Number of clusters written
+        """
+        if not clusters:
+            return 0
+
+        for attempt in range(1, SAVE_ATTEMPTS + 1):
+            try:
+                self._upsert(db, clusters)
+                db.commit()
+                break
+            except IntegrityError:
+                db.rollback()
+                if attempt == SAVE_ATTEMPTS:
+                    raise
+                logger.info(f"Clusters inserted concurrently, retrying save (attempt {attempt + 1})")
+
+        logger.info(f"Persisted {len(clusters)} clusters")
+        return len(clusters)
+
+    def _upsert(self, db: Session, clusters: List[Dict[str, Any]]) -> None:
+        existing = self._load_existing(db, [c["cluster_id"] for c in clusters])
+        for data in clusters:
+            record = existing.get(data["cluster_id"])
+            if record is None:
+                record = Cluster(cluster_id=data["cluster_id"])
+                db.add(record)
+                existing[data["cluster_id"]] = record
+            self._apply(record, data)
+
+    def cluster_exists(self, db: Session, cluster_id: str) -> bool:
+        return db.query(Cluster.id).filter(Cluster.cluster_id == cluster_id).first() is not None
+
+    def _load_existing(self, db: Session, cluster_ids: List[str]) -> Dict[str, Cluster]:
+        return {
+            row.cluster_id: row
+            for row in db.query(Cluster).filter(Cluster.cluster_id.in_(cluster_ids))
+        }
+
+    def _apply(self, record: Cluster, data: Dict[str, Any]) -> None:
+        funding = data["funding_stats"]
+        swaps = data["swap_stats"]
+        children_funded = funding["children_funded"]
+
+        record.parent_wallet = data["parent_wallet"]
+        record.cluster_type = data["cluster_type"]
+        record.formation_time = datetime.fromisoformat(data["formation_time"])
+        record.formation_window = data.get("formation_window")
+        record.funding_token = funding["funding_token"]
+        record.funding_token_symbol = funding["funding_token_symbol"]
+        record.children_funded = children_funded
+        record.total_amount_sent = funding["total_amount_sent"]
+        record.children_swapped = swaps["children_swapped"]
+        record.total_amount_swapped = swaps["total_amount_swapped"]
+        record.swap_completion_rate = round(
+            swaps["children_swapped"] / children_funded * 100, 1
+        ) if children_funded else 0.0
+        record.coordinated_target = swaps["coordinated_target"]
+
+        record.target_tokens = [
+            ClusterTargetToken(mint=mint) for mint in swaps["target_tokens"]
+        ]
+        if "children" in data:
+            record.children = [
+                ClusterChild(
+                    wallet=child["wallet"],
+                    funded_amount=child["funded_amount"],
+                    swap_status=child["swap_status"],
+                    swap_amount=child["swap_amount"],
+                    swap_time=datetime.fromisoformat(child["swap_time"]) if child["swap_time"] else None,
+                    target_tokens=",".join(child["target_tokens"]),
+                )
+                for child in data["children"]
+            ]
+
+    def list_clusters(
+        self,
+        db: Session,
+        *,
+        cluster_type: Optional[str] = None,
+        token: Optional[str] = None,
+        parent_wallet: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        min_children: Optional[int] = None,
+        min_completion_rate: Optional[float] = None,
+        sort_by: str = "formation_time",
+        order: str = "desc",
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List persisted clusters as summary rows using keyset pagination.
+
+        Rows are ordered by (sort_by, id) and the cursor encodes the last row
+        seen, so each page is an index range scan rather than an OFFSET skip.
+
+        Returns:
+            Tuple of (summary rows, cursor for the next page or None)
+
+        Raises:
+            ValueError: If sort_by is unknown or the cursor is malformed
+        """
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort_by}")
+        sort_column = SORTABLE_COLUMNS[sort_by]
+        descending = order == "desc"
+
+        query = db.query(*SUMMARY_COLUMNS)
+
+        if cluster_type:
+            query = query.filter(Cluster.cluster_type == cluster_type)
+        if parent_wallet:
+            query = query.filter(Cluster.parent_wallet == parent_wallet)
+        if token:
+            target_match = (
+                db.query(ClusterTargetToken.cluster_pk)
+                .filter(ClusterTargetToken.mint == token)
+            )
+            query = query.filter(
+                (Cluster.funding_token == token)
+                | (Cluster.funding_token_symbol == token)
+                | Cluster.id.in_(target_match)
+            )
+        if start_time:
+            query = query.filter(Cluster.formation_time >= start_time)
+        if end_time:
+            query = query.filter(Cluster.formation_time <= end_time)
+        if min_children is not None:
+            query = query.filter(Cluster.children_funded >= min_children)
+        if min_completion_rate is not None:
+            query = query.filter(Cluster.swap_completion_rate >= min_completion_rate)
+
+        if cursor:
+            last_value, last_id = self._decode_cursor(cursor, sort_by, order)
+            key = tuple_(sort_column, Cluster.id)
+            query = query.filter(key < (last_value, last_id) if descending else key > (last_value, last_id))
+
+        if descending:
+            query = query.order_by(sort_column.desc(), Cluster.id.desc())
+        else:
+            query = query.order_by(sort_column.asc(), Cluster.id.asc())
+
+        # Fetch one extra row to know whether another page exists
+        rows = [row._asdict() for row in query.limit(limit + 1)]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = self._encode_cursor(sort_by, order, last[sort_by], last["id"])
+
+        return rows, next_cursor
+
+    def get_cluster(self, db: Session, cluster_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single persisted cluster with its children and target tokens.
+        """
+        record = db.query(Cluster).filter(Cluster.cluster_id == cluster_id).first()
+        if record is None:
+            return None
+
+        detail = {column.key: getattr(record, column.key) for column in SUMMARY_COLUMNS}
+        detail["formation_window"] = record.formation_window
+        detail["target_tokens"] = [t.mint for t in record.target_tokens]
+        detail["children"] = [
+            {
+                "wallet": child.wallet,
+                "funded_amount": child.funded_amount,
+                "swap_status": child.swap_status,
+                "swap_amount": child.swap_amount,
+                "swap_time": child.swap_time,
+                "target_tokens": child.target_tokens.split(",") if child.target_tokens else [],
+            }
+            for child in record.children
+        ]
+        return detail
+
+    def _encode_cursor(self, sort_by: str, order: str, value: Any, row_id: int) -> str:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps([sort_by, order, value, row_id]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def _decode_cursor(self, cursor: str, sort_by: str, order: str) -> Tuple[Any, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            cursor_sort_by, cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+        # A cursor only marks a position in the ordering it was issued for
+        if (cursor_sort_by, cursor_order) != (sort_by, order):
+            raise ValueError(
+                f"Cursor was issued for sort_by={cursor_sort_by}&order={cursor_order}, "
+                f"not sort_by={sort_by}&order={order}"
+            )
+
+        try:
+            if sort_by == "formation_time":
+                value = datetime.fromisoformat(value)
+            return value, int(row_id)
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
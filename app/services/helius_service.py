@@ -1,10 +1,13 @@
 # app/services/helius_service.py
+import asyncio
 import httpx
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable
 from datetime import datetime, timedelta
+from bisect import bisect_right
 from collections import defaultdict
 from app.core.config import settings
+from app.services.parse_cache import parse_cache
 
 
 SOL_MINT = "So11111111111111111111111111111111111111112"
@@ -25,29 +28,49 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class HeliusService:
-    def __init__(self):
-        self.api_key = settings.HELIUS_API_KEY
-        self.base_url = settings.HELIUS_BASE_URL
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = api_key or settings.HELIUS_API_KEY
+        self.base_url = base_url or settings.HELIUS_BASE_URL
+        self.transport = transport  # e.g. HeliusStandIn.transport() to run without the real API
     
-    async def get_raw_transactions(self, wallet_address: str, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get_raw_transactions(
+        self,
+        wallet_address: str,
+        limit: int = 100,
+        before: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Calls the Helius API to get parsed transactions for a wallet address.
         
         Args:
             wallet_address (str): Solana wallet address
             limit (int): Number of transactions to fetch (max 1000)
+            before (str): Only return transactions older than this signature,
+                used to page backwards through history
+            until (str): Only return transactions newer than this signature,
+                used to catch up on history already partly fetched
 
         Returns:
-            List[Dict[str, Any]]: List of decoded transaction data
+            List[Dict[str, Any]]: List of decoded transaction data, newest first
         """
         url = f"{self.base_url}/addresses/{wallet_address}/transactions"
         params = {
             "api-key": self.api_key,
             "limit": limit
         }
+        if before:
+            params["before"] = before
+        if until:
+            params["until"] = until
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=self.transport) as client:
                 logger.info(f"Making request to: {url}")
                 logger.info(f"With params: {params}")
                 response = await client.get(url, params=params)
@@ -67,13 +90,32 @@ class HeliusService:
 
         return []
 
+    async def get_transactions_for_wallets(self, wallet_addresses: List[str], limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Fetch transactions for several wallets concurrently and merge them.
 
+        Transactions shared between the wallets are returned once per wallet;
+        detect_wallet_clusters drops the repeated signatures.
+
+        Args:
+            wallet_addresses (List[str]): Solana wallet addresses
+            limit (int): Number of transactions to fetch per wallet
+
+        Returns:
+            List[Dict[str, Any]]: Combined transaction data for all wallets
+        """
+        results = await asyncio.gather(
+            *(self.get_raw_transactions(address, limit) for address in wallet_addresses)
+        )
+        return [txn for wallet_transactions in results for txn in wallet_transactions]
 
     def detect_wallet_clusters(
         self,
         transactions: List[Dict[str, Any]],
         min_children: int = 5,
-        funding_window_minutes: int = 5
+        funding_window_minutes: int = 5,
+        include_children: Union[bool, Callable[[str], bool]] = True,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Detect wallet clusters where a parent wallet funds multiple child wallets
@@ -83,133 +125,252 @@ class HeliusService:
             transactions: List of transaction data from Helius
             min_children: Minimum number of children required to form a cluster (default: 5)
             funding_window_minutes: Time window for cluster formation (default: 5 minutes)
+            include_children: Build the per-child breakdown of each cluster, or a
+                predicate deciding it per cluster_id (default: True)
+            use_cache: Share parsed transactions through the process-wide parse
+                cache; one-off bulk scans pass False (default: True)
             
         Returns:
             Dict containing detected clusters and statistics
         """
-        # Step 1: Extract all funding events
-        logger.info("Extracting funding events from transactions...")
+        event_index = self.build_event_index(transactions, use_cache)
+
+        logger.info("Detecting funding clusters...")
+        cluster_analysis = self.find_clusters(
+            event_index, [min_children], funding_window_minutes, include_children
+        )[min_children]
+        logger.info(f"Found {cluster_analysis['summary']['clusters_found']} wallet clusters")
+        return cluster_analysis
+
+    def build_event_index(self, transactions: List[Dict[str, Any]], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Extract funding and swap events and group funding events by parent.
+
+        The index only depends on the transactions, so it can be built once
+        and evaluated with find_clusters for any detection parameters. Bulk
+        one-off loads should pass use_cache=False: a scan larger than the
+        cache budget evicts its own entries before they are reused, and
+        would flush the entries live API scans share.
+
+        Returns:
+            Dict with "parents" (parent -> (events, timestamps), sorted by time),
+            "swap_events" (wallet -> last swap) and transaction counts
+        """
+        # Step 1 & 2: Extract funding and swap events. Each signature is
+        # analyzed once per scan (the same transaction appears in the history
+        # of every wallet it touches) and parsed once per process.
+        logger.info("Extracting funding and swap events from transactions...")
         funding_events = []
-        
-        for txn in transactions:
-            timestamp = datetime.fromtimestamp(txn["timestamp"])
-            
-            # Extract token transfers (includes SOL transfers)
-            for transfer in txn.get("tokenTransfers", []):
-                from_wallet = transfer.get("fromUserAccount")
-                to_wallet = transfer.get("toUserAccount")
-                amount = float(transfer.get("tokenAmount", 0))
-                mint = transfer.get("mint")
-                
-                if from_wallet and to_wallet and from_wallet != to_wallet and amount > 0:
-                    funding_events.append({
-                        "parent": from_wallet,
-                        "child": to_wallet,
-                        "mint": mint,
-                        "amount": amount,
-                        "timestamp": timestamp,
-                        "signature": txn.get("signature")
-                    })
-        
-        # Step 2: Extract all swap events
-        logger.info("Extracting swap events from transactions...")
         swap_events = {}  # wallet -> swap_info
-        
+        seen_signatures = set()
+        duplicates_skipped = 0
+
         for txn in transactions:
-            if txn.get("type") == "SWAP":
-                timestamp = datetime.fromtimestamp(txn["timestamp"])
-                fee_payer = txn.get("feePayer")
-                
-                if fee_payer and "events" in txn and "swap" in txn["events"]:
-                    swap_data = txn["events"]["swap"]
-                    
-                    # Extract input tokens (what was put into the swap)
-                    input_mints = []
-                    input_amounts = []
-                    for token_input in swap_data.get("tokenInputs", []):
-                        if token_input.get("userAccount") == fee_payer:
-                            input_mints.append(token_input.get("mint"))
-                            raw_amount = token_input.get("rawTokenAmount", {})
-                            amount = float(raw_amount.get("tokenAmount", 0))
-                            decimals = raw_amount.get("decimals", 0)
-                            input_amounts.append(amount / (10 ** decimals))
-                    
-                    # Extract output tokens (what came out of the swap)
-                    output_mints = []
-                    for inner_swap in swap_data.get("innerSwaps", []):
-                        for token_output in inner_swap.get("tokenOutputs", []):
-                            if token_output.get("toUserAccount") == fee_payer:
-                                output_mints.append(token_output.get("mint"))
-                    
-                    swap_events[fee_payer] = {
-                        "timestamp": timestamp,
-                        "input_mints": input_mints,
-                        "output_mints": output_mints,
-                        "input_amounts": input_amounts,
-                        "signature": txn.get("signature")
-                    }
-        
-        # Step 3: Find funding clusters
-        logger.info("Detecting funding clusters...")
-        clusters = []
+            signature = txn.get("signature")
+            if signature:
+                if signature in seen_signatures:
+                    duplicates_skipped += 1
+                    continue
+                seen_signatures.add(signature)
+
+            if use_cache:
+                txn_funding_events, swap_event = parse_cache.get_or_parse(txn, self._parse_transaction)
+            else:
+                txn_funding_events, swap_event = self._parse_transaction(txn)
+            funding_events.extend(txn_funding_events)
+            if swap_event:
+                swap_events[swap_event["wallet"]] = swap_event
+
+        # Group funding events by parent, sorted by timestamp
         parent_funding_groups = defaultdict(list)
-        
-        # Group funding events by parent
         for event in funding_events:
             parent_funding_groups[event["parent"]].append(event)
-        
-        # Check each parent for cluster formation
+
+        parents = {}
         for parent, parent_events in parent_funding_groups.items():
-            # Sort events by timestamp
             sorted_events = sorted(parent_events, key=lambda x: x["timestamp"])
-            
-            # Use sliding window to find clusters
-            for i in range(len(sorted_events)):
-                window_start = sorted_events[i]["timestamp"]
-                window_end = window_start + timedelta(minutes=funding_window_minutes)
-                
-                # Find all events within this window
-                window_events = []
-                for j in range(i, len(sorted_events)):
-                    if sorted_events[j]["timestamp"] <= window_end:
-                        window_events.append(sorted_events[j])
-                    else:
-                        break
-                
-                # Check if we have enough children for a cluster
-                unique_children = list(set(event["child"] for event in window_events))
-                if len(unique_children) >= min_children:
-                    
-                    # Analyze cluster
-                    cluster = self._analyze_cluster(
-                        parent, 
-                        window_events, 
-                        unique_children, 
-                        swap_events, 
-                        window_start, 
-                        window_end
-                    )
-                    
-                    clusters.append(cluster)
-                    break  # Found a cluster for this parent, move to next parent
-        
-        logger.info(f"Found {len(clusters)} wallet clusters")
-        
+            parents[parent] = (sorted_events, [event["timestamp"] for event in sorted_events])
+
         return {
-            "detection_params": {
-                "min_children": min_children,
-                "funding_window_minutes": funding_window_minutes,
-                "total_transactions_analyzed": len(transactions)
-            },
-            "summary": {
-                "clusters_found": len(clusters),
-                "total_parents": len([c for c in clusters]),
-                "total_children": sum(c["funding_stats"]["children_funded"] for c in clusters),
-                "total_children_swapped": sum(c["swap_stats"]["children_swapped"] for c in clusters)
-            },
-            "clusters": clusters
+            "parents": parents,
+            "swap_events": swap_events,
+            "total_transactions_analyzed": len(transactions) - duplicates_skipped,
+            "duplicate_transactions_skipped": duplicates_skipped
         }
+
+    def find_clusters(
+        self,
+        event_index: Dict[str, Any],
+        min_children_values: List[int],
+        funding_window_minutes: int = 5,
+        include_children: Union[bool, Callable[[str], bool]] = True
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Find clusters in a prebuilt event index for several min_children values.
+
+        Every parent is scanned once per call regardless of how many
+        min_children values are requested.
+
+        Returns:
+            Dict of min_children -> detection result (same shape as
+            detect_wallet_clusters)
+        """
+        # Step 3: Find funding clusters
+        thresholds = sorted(set(min_children_values))
+        window = timedelta(minutes=funding_window_minutes)
+        clusters_by_threshold = {m: [] for m in thresholds}
+
+        # Check each parent for cluster formation
+        for parent, (sorted_events, timestamps) in event_index["parents"].items():
+            first_windows = self._first_cluster_windows(sorted_events, timestamps, window, thresholds)
+
+            # Analyze each distinct window once and share it between thresholds
+            analyzed = {}
+            for m, i in first_windows.items():
+                if i not in analyzed:
+                    window_start = timestamps[i]
+                    window_end = window_start + window
+                    window_events = sorted_events[i:bisect_right(timestamps, window_end, lo=i)]
+                    unique_children = list(set(event["child"] for event in window_events))
+                    analyzed[i] = self._analyze_cluster(
+                        parent,
+                        window_events,
+                        unique_children,
+                        event_index["swap_events"],
+                        window_start,
+                        window_end,
+                        include_children
+                    )
+                clusters_by_threshold[m].append(analyzed[i])
+
+        results = {}
+        for m, clusters in clusters_by_threshold.items():
+            results[m] = {
+                "detection_params": {
+                    "min_children": m,
+                    "funding_window_minutes": funding_window_minutes,
+                    "total_transactions_analyzed": event_index["total_transactions_analyzed"],
+                    "duplicate_transactions_skipped": event_index["duplicate_transactions_skipped"]
+                },
+                "summary": {
+                    "clusters_found": len(clusters),
+                    "total_parents": len([c for c in clusters]),
+                    "total_children": sum(c["funding_stats"]["children_funded"] for c in clusters),
+                    "total_children_swapped": sum(c["swap_stats"]["children_swapped"] for c in clusters)
+                },
+                "clusters": clusters
+            }
+        return results
+
+    def _first_cluster_windows(
+        self,
+        sorted_events: List[Dict[str, Any]],
+        timestamps: List[datetime],
+        window: timedelta,
+        thresholds: List[int]
+    ) -> Dict[int, int]:
+        """
+        For each threshold (ascending), find the earliest event index whose
+        funding window reaches that many unique children.
+
+        Slides a two-pointer window over the parent's events, keeping a count
+        per child, so each parent is scanned in linear time.
+
+        Returns:
+            Dict of threshold -> start index, for thresholds that were reached
+        """
+        first_windows = {}
+        child_counts = defaultdict(int)
+        next_threshold = 0
+        j = 0
+
+        for i in range(len(sorted_events)):
+            window_end = timestamps[i] + window
+            while j < len(sorted_events) and timestamps[j] <= window_end:
+                child_counts[sorted_events[j]["child"]] += 1
+                j += 1
+
+            unique_children = len(child_counts)
+            while next_threshold < len(thresholds) and thresholds[next_threshold] <= unique_children:
+                first_windows[thresholds[next_threshold]] = i
+                next_threshold += 1
+            if next_threshold == len(thresholds):
+                break
+
+            child = sorted_events[i]["child"]
+            child_counts[child] -= 1
+            if not child_counts[child]:
+                del child_counts[child]
+
+        return first_windows
     
+    def _parse_transaction(self, txn: Dict[str, Any]) -> Tuple[Tuple[Dict[str, Any], ...], Optional[Dict[str, Any]]]:
+        """
+        Decode a single transaction into funding events and an optional swap event.
+
+        The result only depends on the transaction itself, so it is cached by
+        signature and shared between scans. Callers must not mutate it.
+
+        Returns:
+            Tuple of (funding events, swap event or None)
+        """
+        timestamp = datetime.fromtimestamp(txn["timestamp"])
+
+        # Extract token transfers (includes SOL transfers)
+        funding_events = []
+        for transfer in txn.get("tokenTransfers", []):
+            from_wallet = transfer.get("fromUserAccount")
+            to_wallet = transfer.get("toUserAccount")
+            amount = float(transfer.get("tokenAmount", 0))
+            mint = transfer.get("mint")
+
+            if from_wallet and to_wallet and from_wallet != to_wallet and amount > 0:
+                funding_events.append({
+                    "parent": from_wallet,
+                    "child": to_wallet,
+                    "mint": mint,
+                    "amount": amount,
+                    "timestamp": timestamp,
+                    "signature": txn.get("signature")
+                })
+
+        # Extract swap made by the fee payer
+        swap_event = None
+        if txn.get("type") == "SWAP":
+            fee_payer = txn.get("feePayer")
+
+            if fee_payer and "events" in txn and "swap" in txn["events"]:
+                swap_data = txn["events"]["swap"]
+
+                # Extract input tokens (what was put into the swap)
+                input_mints = []
+                input_amounts = []
+                for token_input in swap_data.get("tokenInputs", []):
+                    if token_input.get("userAccount") == fee_payer:
+                        input_mints.append(token_input.get("mint"))
+                        raw_amount = token_input.get("rawTokenAmount", {})
+                        amount = float(raw_amount.get("tokenAmount", 0))
+                        decimals = raw_amount.get("decimals", 0)
+                        input_amounts.append(amount / (10 ** decimals))
+
+                # Extract output tokens (what came out of the swap)
+                output_mints = []
+                for inner_swap in swap_data.get("innerSwaps", []):
+                    for token_output in inner_swap.get("tokenOutputs", []):
+                        if token_output.get("toUserAccount") == fee_payer:
+                            output_mints.append(token_output.get("mint"))
+
+                swap_event = {
+                    "wallet": fee_payer,
+                    "timestamp": timestamp,
+                    "input_mints": input_mints,
+                    "output_mints": output_mints,
+                    "input_amounts": input_amounts,
+                    "signature": txn.get("signature")
+                }
+
+        return tuple(funding_events), swap_event
+
     def _analyze_cluster(
         self, 
         parent: str, 
@@ -217,11 +378,20 @@ class HeliusService:
         children: List[str], 
         swap_events: Dict, 
         window_start: datetime, 
-        window_end: datetime
+        window_end: datetime,
+        include_children: Union[bool, Callable[[str], bool]] = True
     ) -> Dict[str, Any]:
         """
         Analyze a detected cluster to extract detailed statistics.
+
+        With include_children=False (or a predicate returning False for the
+        cluster_id) the per-child breakdown is not built; the funding and
+        swap statistics are unaffected.
         """
+        cluster_id = f"{parent}_{int(window_start.timestamp())}"
+        if callable(include_children):
+            include_children = include_children(cluster_id)
+
         # Calculate funding statistics
         total_funding = sum(event["amount"] for event in funding_events)
         funding_token = funding_events[0]["mint"]  # Assume same token for cluster
@@ -233,38 +403,45 @@ class HeliusService:
         target_tokens = set()
         
         for child in children:
-            child_funding_events = [e for e in funding_events if e["child"] == child]
-            child_funding_amount = sum(e["amount"] for e in child_funding_events)
-            
-            child_info = {
-                "wallet": child,
-                "funded_amount": child_funding_amount,
-                "swap_status": "pending",
-                "swap_amount": 0,
-                "swap_time": None,
-                "target_tokens": []
-            }
+            child_info = None
+            if include_children:
+                child_funding_events = [e for e in funding_events if e["child"] == child]
+                child_funding_amount = sum(e["amount"] for e in child_funding_events)
+                
+                child_info = {
+                    "wallet": child,
+                    "funded_amount": child_funding_amount,
+                    "swap_status": "pending",
+                    "swap_amount": 0,
+                    "swap_time": None,
+                    "target_tokens": []
+                }
             
             # Check if child has swapped
             if child in swap_events:
                 swap = swap_events[child]
                 # Check if child used the funded token in swap
                 if funding_token in swap["input_mints"]:
-                    child_info["swap_status"] = "completed"
+                    swap_amount = 0
                     
                     # Find the amount of funded token used
                     for i, mint in enumerate(swap["input_mints"]):
                         if mint == funding_token and i < len(swap["input_amounts"]):
-                            child_info["swap_amount"] = swap["input_amounts"][i]
+                            swap_amount = swap["input_amounts"][i]
                             total_swap_amount += swap["input_amounts"][i]
                             break
                     
-                    child_info["swap_time"] = swap["timestamp"].isoformat()
-                    child_info["target_tokens"] = swap["output_mints"]
                     children_swapped += 1
                     target_tokens.update(swap["output_mints"])
+                    
+                    if child_info:
+                        child_info["swap_status"] = "completed"
+                        child_info["swap_amount"] = swap_amount
+                        child_info["swap_time"] = swap["timestamp"].isoformat()
+                        child_info["target_tokens"] = swap["output_mints"]
             
-            children_data.append(child_info)
+            if child_info:
+                children_data.append(child_info)
         
         # Determine cluster type based on funding token
         if funding_token in BUYING_POWER_TOKENS:
@@ -272,8 +449,8 @@ class HeliusService:
         else:
             cluster_type = "SELL_CLUSTER"  # Specific token funding = likely for selling
         
-        return {
-            "cluster_id": f"{parent}_{int(window_start.timestamp())}",
+        cluster = {
+            "cluster_id": cluster_id,
             "parent_wallet": parent,
             "formation_time": window_start.isoformat(),
             "formation_window": f"{window_start.isoformat()} - {window_end.isoformat()}",
@@ -293,10 +470,11 @@ class HeliusService:
                 "swap_completion_rate": f"{(children_swapped/len(children)*100):.1f}%",
                 "target_tokens": list(target_tokens),
                 "coordinated_target": len(target_tokens) == 1  # True if all target same token
-            },
-            
-            "children": children_data
+            }
         }
+        if include_children:
+            cluster["children"] = children_data
+        return cluster
     
     def _get_token_symbol(self, mint: str) -> str:
         """
@@ -0,0 +1,89 @@
+# app/services/helius_standin.py
+import json
+from typing import List, Dict, Any, Optional
+
+import httpx
+
+
+class HeliusStandIn:
+    """
+    In-process stand-in for the Helius address transaction history endpoint.
+
+    Serves a recorded set of transactions through an httpx.MockTransport, so
+    HeliusService (and the backfill CLI built on it) runs without network
+    access or an API key:
+
+        standin = HeliusStandIn.from_file("app/reponse.json")
+        helius_service = HeliusService(transport=standin.transport())
+
+    A wallet's history is every recorded transaction that involves it, newest
+    first, paged with the same limit / before / until parameters as Helius.
+    fail_after makes every request after the first N fail with a 503, which
+    simulates an interrupted run.
+    """
+
+    def __init__(self, transactions: List[Dict[str, Any]], fail_after: Optional[int] = None):
+        self.transactions: List[Dict[str, Any]] = []
+        self.fail_after = fail_after
+        self.requests = 0
+        self.add(transactions)
+
+    @classmethod
+    def from_file(cls, path: str) -> "HeliusStandIn":
+        """
+        Load a JSON recording: a list of Helius transactions or a
+        /raw-transactions response ({"transactions": [...]}).
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("transactions", [])
+        return cls(data)
+
+    def add(self, transactions: List[Dict[str, Any]]) -> None:
+        """
+        Record more transactions, e.g. new activity between two backfill runs.
+        """
+        self.transactions = sorted(
+            self.transactions + list(transactions), key=lambda txn: txn["timestamp"], reverse=True
+        )
+
+    def history(self, wallet_address: str) -> List[Dict[str, Any]]:
+        return [txn for txn in self.transactions if wallet_address in self._accounts(txn)]
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.fail_after is not None and self.requests > self.fail_after:
+            return httpx.Response(503, json={"error": "stand-in unavailable"})
+
+        parts = request.url.path.strip("/").split("/")
+        if len(parts) < 3 or parts[-3] != "addresses" or parts[-1] != "transactions":
+            return httpx.Response(404, json={"error": "not found"})
+
+        history = self.history(parts[-2])
+        signatures = [txn["signature"] for txn in history]
+        params = request.url.params
+        start, end = 0, len(history)
+        try:
+            if params.get("before"):
+                start = signatures.index(params["before"]) + 1
+            if params.get("until"):
+                end = signatures.index(params["until"])
+        except ValueError:
+            return httpx.Response(400, json={"error": "unknown signature"})
+
+        limit = int(params.get("limit", 100))
+        return httpx.Response(200, json=history[start:end][:limit])
+
+    def _accounts(self, txn: Dict[str, Any]) -> set:
+        accounts = {txn.get("feePayer")}
+        for transfer in txn.get("nativeTransfers") or []:
+            accounts.update((transfer.get("fromUserAccount"), transfer.get("toUserAccount")))
+        for transfer in txn.get("tokenTransfers") or []:
+            accounts.update((transfer.get("fromUserAccount"), transfer.get("toUserAccount")))
+        for account in txn.get("accountData") or []:
+            accounts.add(account.get("account"))
+        return accounts
@@ -0,0 +1,215 @@
+# app/services/lease_service.py
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case, or_
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.wallet_lease import WalletLease
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """
+    Identifier for this worker process, unique across hosts and uvicorn workers.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class LeaseBackend:
+    """
+    Time-limited ownership of wallets so that only one worker polls each one.
+
+    A lease is held until it expires; the owner renews it by calling acquire
+    again before the TTL runs out. If the owner dies, the lease lapses and the
+    next worker to call acquire takes the wallet over.
+    """
+
+    def acquire(self, wallet_address: str, owner_id: str, ttl_seconds: int) -> bool:
+        """
+        Acquire or renew the lease on a wallet.
+
+        Returns:
+            True if owner_id holds the lease after the call
+        """
+        raise NotImplementedError
+
+    def release(self, wallet_address: str, owner_id: str) -> None:
+        """
+        Give up a lease early so another worker can pick the wallet up.
+        """
+        raise NotImplementedError
+
+    def get_owner(self, wallet_address: str) -> Optional[str]:
+        """
+        Current owner of an unexpired lease, or None.
+        """
+        raise NotImplementedError
+
+    def live_owners(self) -> Set[str]:
+        """
+        Owners holding at least one unexpired lease.
+        """
+        raise NotImplementedError
+
+
+class DatabaseLeaseBackend(LeaseBackend):
+    """
+    Leases stored in the wallet_leases table of the application database,
+    shared by every worker that points at the same DATABASE_URL.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def acquire(self, wallet_address: str, owner_id: str, ttl_seconds: int) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl_seconds)
+
+        db = self.session_factory()
+        try:
+            # Conditional update: renews our own lease or takes over an expired
+            # one. The database serialises concurrent updates of the same row,
+            # so at most one worker sees rowcount == 1.
+            updated = (
+                db.query(WalletLease)
+                .filter(
+                    WalletLease.wallet_address == wallet_address,
+                    or_(WalletLease.owner_id == owner_id, WalletLease.expires_at < now),
+                )
+                .update(
+                    {
+                        WalletLease.acquired_at: case(
+                            (WalletLease.owner_id == owner_id, WalletLease.acquired_at),
+                            else_=now,
+                        ),
+                        WalletLease.owner_id: owner_id,
+                        WalletLease.expires_at: expires_at,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            if updated:
+                db.commit()
+                return True
+
+            # No row updated: either nobody has leased the wallet yet, or
+            # another worker holds a live lease. The primary key settles races
+            # between workers inserting the first lease.
+            db.add(WalletLease(
+                wallet_address=wallet_address,
+                owner_id=owner_id,
+                expires_at=expires_at,
+                acquired_at=now,
+            ))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+        except OperationalError as e:
+            # e.g. SQLite "database is locked" while another worker writes;
+            # treat as not acquired and let the next attempt retry
+            db.rollback()
+            logger.warning(f"Could not acquire lease on {wallet_address}: {str(e)}")
+            return False
+        finally:
+            db.close()
+
+    def release(self, wallet_address: str, owner_id: str) -> None:
+        db = self.session_factory()
+        try:
+            db.query(WalletLease).filter(
+                WalletLease.wallet_address == wallet_address,
+                WalletLease.owner_id == owner_id,
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def get_owner(self, wallet_address: str) -> Optional[str]:
+        db = self.session_factory()
+        try:
+            lease = db.query(WalletLease).filter(
+                WalletLease.wallet_address == wallet_address,
+                WalletLease.expires_at >= datetime.utcnow(),
+            ).first()
+            return lease.owner_id if lease else None
+        finally:
+            db.close()
+
+    def live_owners(self) -> Set[str]:
+        db = self.session_factory()
+        try:
+            rows = db.query(WalletLease.owner_id).filter(
+                WalletLease.expires_at >= datetime.utcnow()
+            ).distinct()
+            return {row.owner_id for row in rows}
+        finally:
+            db.close()
+
+
+class InMemoryLeaseBackend(LeaseBackend):
+    """
+    Process-local stand-in for DatabaseLeaseBackend.
+
+    Only coordinates callers inside one process, which is enough for a single
+    uvicorn worker and for exercising the poller without a shared database.
+    """
+
+    def __init__(self):
+        self._leases: Dict[str, Tuple[str, datetime]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, wallet_address: str, owner_id: str, ttl_seconds: int) -> bool:
+        now = datetime.utcnow()
+        with self._lock:
+            current = self._leases.get(wallet_address)
+            if current and current[0] != owner_id and current[1] >= now:
+                return False
+            self._leases[wallet_address] = (owner_id, now + timedelta(seconds=ttl_seconds))
+            return True
+
+    def release(self, wallet_address: str, owner_id: str) -> None:
+        with self._lock:
+            current = self._leases.get(wallet_address)
+            if current and current[0] == owner_id:
+                del self._leases[wallet_address]
+
+    def get_owner(self, wallet_address: str) -> Optional[str]:
+        with self._lock:
+            current = self._leases.get(wallet_address)
+            if current and current[1] >= datetime.utcnow():
+                return current[0]
+            return None
+
+    def live_owners(self) -> Set[str]:
+        now = datetime.utcnow()
+        with self._lock:
+            return {owner for owner, expires_at in self._leases.values() if expires_at >= now}
+
+
+def get_lease_backend(name: str = None) -> LeaseBackend:
+    """
+    Build the lease backend selected by settings.LEASE_BACKEND.
+    """
+    name = name or settings.LEASE_BACKEND
+    if name == "database":
+        return DatabaseLeaseBackend()
+    if name == "memory":
+        return InMemoryLeaseBackend()
+    raise ValueError(f"Unknown lease backend: {name}")
+
+
+def owned_wallets(backend: LeaseBackend, wallets: List[str], owner_id: str, ttl_seconds: int) -> List[str]:
+    """
+    Acquire or renew leases for a list of wallets, returning those now owned.
+    """
+    return [w for w in wallets if backend.acquire(w, owner_id, ttl_seconds)]
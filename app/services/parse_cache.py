@@ -0,0 +1,110 @@
+# app/services/parse_cache.py
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+# Approximate footprint of a parsed entry, measured with a recursive
+# sys.getsizeof walk over recorded Helius transactions. Charging a fixed cost
+# per event keeps put() constant time; walking each entry cost more than
+# parsing the transaction in the first place.
+ENTRY_BYTES = 256  # Key, tuple and LRU bookkeeping
+FUNDING_EVENT_BYTES = 1024
+SWAP_EVENT_BYTES = 1536
+
+
+def estimate_size(parsed: Any) -> int:
+    """
+    Approximate memory footprint in bytes of a parsed (funding events, swap event) entry.
+    """
+    funding_events, swap_event = parsed
+    return ENTRY_BYTES + FUNDING_EVENT_BYTES * len(funding_events) + (SWAP_EVENT_BYTES if swap_event else 0)
+
+
+class ParsedTransactionCache:
+    """
+    Process-wide cache of parsed transactions keyed by signature.
+
+    The same signature shows up in the history of every wallet it touches,
+    so related wallets share most of their parsing work. Entries are evicted
+    least-recently-used first once their estimated size exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, signature: str) -> bool:
+        with self._lock:
+            return signature in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, signature: str) -> Optional[Any]:
+        with self._lock:
+            if signature not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(signature)
+            self.hits += 1
+            return self._entries[signature]
+
+    def put(self, signature: str, value: Any) -> None:
+        size = estimate_size(value)
+        with self._lock:
+            if signature in self._entries:
+                self._total_bytes -= self._sizes[signature]
+            elif size > self.max_bytes:
+                return
+            self._entries[signature] = value
+            self._entries.move_to_end(signature)
+            self._sizes[signature] = size
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+
+    def get_or_parse(self, txn: Dict[str, Any], parser: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Return the parsed form of txn, running parser only on a cache miss.
+
+        Transactions without a signature cannot be shared and are parsed
+        every time.
+        """
+        signature = txn.get("signature")
+        if not signature:
+            return parser(txn)
+        parsed = self.get(signature)
+        if parsed is None:
+            parsed = parser(txn)
+            self.put(signature, parsed)
+        return parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+parse_cache = ParsedTransactionCache(settings.PARSE_CACHE_MAX_BYTES)
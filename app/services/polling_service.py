@@ -0,0 +1,195 @@
+# app/services/polling_service.py
+import asyncio
+import functools
+import logging
+import math
+import random
+import threading
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.cluster_service import ClusterService
+from app.services.helius_service import HeliusService
+from app.services.lease_service import LeaseBackend, default_worker_id, get_lease_backend
+
+logger = logging.getLogger(__name__)
+
+# Lease key each poller holds while alive, so idle workers count towards the
+# fair share even before they own a wallet.
+WORKER_KEY_PREFIX = "worker:"
+
+
+class WalletPoller:
+    """
+    Background loop that polls watched wallets and persists detected clusters.
+
+    Every uvicorn worker runs its own poller, but a wallet is only polled by
+    the worker holding its lease. Leases are renewed by a heartbeat that runs
+    independently of polling, so a slow round does not let them lapse. Each
+    round a worker claims free wallets up to its fair share (watched wallets
+    divided by live workers) and releases any above it, which spreads the
+    wallets out as workers join. Results go to the clusters table, so any
+    worker can serve them through the /clusters endpoints.
+    """
+
+    def __init__(
+        self,
+        wallets: Optional[List[str]] = None,
+        lease_backend: Optional[LeaseBackend] = None,
+        worker_id: Optional[str] = None,
+        helius_service: Optional[HeliusService] = None,
+        cluster_service: Optional[ClusterService] = None,
+        session_factory=SessionLocal,
+    ):
+        self.wallets = list(wallets if wallets is not None else settings.WATCHED_WALLETS)
+        self.lease_backend = lease_backend or get_lease_backend()
+        self.worker_id = worker_id or default_worker_id()
+        self.helius_service = helius_service or HeliusService()
+        self.cluster_service = cluster_service or ClusterService()
+        self.session_factory = session_factory
+        self.interval = settings.POLL_INTERVAL_SECONDS
+        self.lease_ttl = settings.LEASE_TTL_SECONDS
+        self._owned: set = set()
+        self._lock = threading.Lock()
+        # Workers try free wallets in different orders so they do not all
+        # contend for the same ones
+        self._claim_order = list(self.wallets)
+        random.Random(self.worker_id).shuffle(self._claim_order)
+
+    async def run(self) -> None:
+        """
+        Poll until cancelled, releasing held leases on the way out.
+        """
+        logger.info(f"Worker {self.worker_id} polling {len(self.wallets)} watched wallets every {self.interval}s")
+        heartbeat = asyncio.create_task(self.heartbeat())
+        try:
+            while True:
+                # A failed round (e.g. the lease database is briefly locked)
+                # must not end the poller; the next round starts over.
+                try:
+                    await self.poll_once()
+                except Exception as e:
+                    logger.error(f"Error in polling round on worker {self.worker_id}: {str(e)}")
+                await asyncio.sleep(self.interval)
+        finally:
+            heartbeat.cancel()
+            self.release_all()
+
+    async def heartbeat(self) -> None:
+        """
+        Renew held leases every third of the TTL until cancelled.
+        """
+        while True:
+            try:
+                await self._run_sync(self.renew_leases)
+            except Exception as e:
+                logger.error(f"Error renewing leases: {str(e)}")
+            await asyncio.sleep(self.lease_ttl / 3)
+
+    async def poll_once(self) -> List[str]:
+        """
+        Run one polling round over the wallets this worker owns.
+
+        Returns:
+            Wallets polled by this worker in this round
+        """
+        await self._run_sync(self.rebalance)
+
+        polled = []
+        for wallet_address in self.wallets:
+            if wallet_address not in self._owned:
+                continue
+            try:
+                # Confirm (and renew) ownership right before polling; a lease lost
+                # to expiry since the start of the round is left to its new owner.
+                if not await self._run_sync(self._renew, wallet_address):
+                    continue
+                await self.poll_wallet(wallet_address)
+                polled.append(wallet_address)
+            except Exception as e:
+                logger.error(f"Error polling wallet {wallet_address}: {str(e)}")
+        return polled
+
+    async def poll_wallet(self, wallet_address: str) -> int:
+        """
+        Fetch recent transactions for a wallet and persist detected clusters.
+
+        Detection and the database write run in the default executor so they
+        do not block the event loop serving requests.
+        """
+        transactions = await self.helius_service.get_raw_transactions(wallet_address, 100)
+        cluster_analysis = await self._run_sync(
+            self.helius_service.detect_wallet_clusters,
+            transactions, settings.MIN_CHILD_WALLETS, settings.DETECTION_WINDOW_MINUTES,
+        )
+        return await self._run_sync(self._save_clusters, cluster_analysis["clusters"])
+
+    def renew_leases(self) -> None:
+        """
+        Renew this worker's presence lease and every wallet lease it holds.
+        """
+        self.lease_backend.acquire(self._worker_key, self.worker_id, self.lease_ttl)
+        for wallet_address in list(self._owned):
+            self._renew(wallet_address)
+
+    def rebalance(self) -> None:
+        """
+        Renew held leases, then release or claim wallets to reach the fair share.
+        """
+        self.renew_leases()
+        live_workers = max(1, len(self.lease_backend.live_owners()))
+        share = math.ceil(len(self.wallets) / live_workers)
+
+        with self._lock:
+            owned = [w for w in self._claim_order if w in self._owned]
+        for wallet_address in owned[share:]:
+            logger.info(f"Worker {self.worker_id} handing off {wallet_address} ({live_workers} workers live)")
+            self.lease_backend.release(wallet_address, self.worker_id)
+            with self._lock:
+                self._owned.discard(wallet_address)
+
+        for wallet_address in self._claim_order:
+            if len(self._owned) >= share:
+                break
+            if wallet_address in self._owned:
+                continue
+            if self.lease_backend.acquire(wallet_address, self.worker_id, self.lease_ttl):
+                logger.info(f"Worker {self.worker_id} acquired lease on {wallet_address}")
+                with self._lock:
+                    self._owned.add(wallet_address)
+
+    def release_all(self) -> None:
+        """
+        Release every lease held by this worker so others can take over at once.
+        """
+        for wallet_address in list(self._owned) + [self._worker_key]:
+            try:
+                self.lease_backend.release(wallet_address, self.worker_id)
+            except Exception as e:
+                logger.error(f"Error releasing lease on {wallet_address}: {str(e)}")
+        self._owned.clear()
+
+    @property
+    def _worker_key(self) -> str:
+        return f"{WORKER_KEY_PREFIX}{self.worker_id}"
+
+    def _renew(self, wallet_address: str) -> bool:
+        if self.lease_backend.acquire(wallet_address, self.worker_id, self.lease_ttl):
+            return True
+        with self._lock:
+            if wallet_address in self._owned:
+                logger.info(f"Worker {self.worker_id} lost lease on {wallet_address}")
+                self._owned.discard(wallet_address)
+        return False
+
+    def _save_clusters(self, clusters: List[dict]) -> int:
+        db = self.session_factory()
+        try:
+            return self.cluster_service.save_clusters(db, clusters)
+        finally:
+            db.close()
+
+    async def _run_sync(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))
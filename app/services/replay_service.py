@@ -0,0 +1,146 @@
+# app/services/replay_service.py
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from app.core.database import SessionLocal
+from app.services.helius_service import HeliusService
+from app.services.transaction_store import TransactionStore
+
+logger = logging.getLogger(__name__)
+
+MIN_CHILDREN_RANGE = list(range(3, 21))  # Same bounds as the cluster-detection endpoint
+FUNDING_WINDOW_RANGE = list(range(1, 31))
+
+# Event index shared with sweep worker processes; set once per worker by
+# _init_worker so it is not sent again with every task.
+_worker_index: Optional[Dict[str, Any]] = None
+
+
+def _init_worker(event_index: Dict[str, Any]) -> None:
+    global _worker_index
+    _worker_index = event_index
+    logging.getLogger("app.services.helius_service").setLevel(logging.WARNING)
+
+
+def _evaluate_window(
+    funding_window_minutes: int,
+    min_children_values: List[int],
+    event_index: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    event_index = event_index if event_index is not None else _worker_index
+    results = HeliusService().find_clusters(
+        event_index, min_children_values, funding_window_minutes, include_children=False
+    )
+    return [_summarize(result) for result in results.values()]
+
+
+def _summarize(result: Dict[str, Any]) -> Dict[str, Any]:
+    clusters = result["clusters"]
+    return {
+        "min_children": result["detection_params"]["min_children"],
+        "funding_window_minutes": result["detection_params"]["funding_window_minutes"],
+        **result["summary"],
+        "buy_clusters": sum(1 for c in clusters if c["cluster_type"] == "BUY_CLUSTER"),
+        "sell_clusters": sum(1 for c in clusters if c["cluster_type"] == "SELL_CLUSTER"),
+    }
+
+
+class ReplayService:
+    """
+    Evaluate cluster detection over a recorded transaction set.
+
+    The recording is parsed and indexed once; every parameter combination is
+    then evaluated against the same index without touching Helius.
+    """
+
+    def __init__(self, helius_service: Optional[HeliusService] = None):
+        self.helius_service = helius_service or HeliusService()
+        self.event_index: Optional[Dict[str, Any]] = None
+
+    def load_fixture(self, path: str) -> int:
+        """
+        Load a JSON recording: a list of Helius transactions or a
+        /raw-transactions response ({"transactions": [...]}).
+
+        Returns:
+            Number of transactions analyzed
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("transactions", [])
+        return self.load_transactions(data)
+
+    def load_store(self, wallet_addresses: Optional[List[str]] = None, session_factory=SessionLocal) -> int:
+        """
+        Load a recording from the local transaction store filled by the backfill CLI.
+
+        Returns:
+            Number of transactions analyzed
+        """
+        db = session_factory()
+        try:
+            transactions = TransactionStore().load_transactions(db, wallet_addresses)
+        finally:
+            db.close()
+        return self.load_transactions(transactions)
+
+    def load_transactions(self, transactions: List[Dict[str, Any]]) -> int:
+        started = time.monotonic()
+        # A recording is indexed once, so the shared parse cache would only churn
+        self.event_index = self.helius_service.build_event_index(transactions, use_cache=False)
+        logger.info(f"Indexed {self.event_index['total_transactions_analyzed']} transactions "
+                    f"({len(self.event_index['parents'])} funding parents) in {time.monotonic() - started:.2f}s")
+        return self.event_index["total_transactions_analyzed"]
+
+    def replay(self, min_children: int = 5, funding_window_minutes: int = 5) -> Dict[str, Any]:
+        """
+        Run detection for a single parameter combination against the loaded recording.
+        """
+        self._require_index()
+        return self.helius_service.find_clusters(self.event_index, [min_children], funding_window_minutes)[min_children]
+
+    def sweep(
+        self,
+        min_children_values: Optional[List[int]] = None,
+        funding_window_values: Optional[List[int]] = None,
+        workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate every (min_children, funding_window) combination.
+
+        Work is split per funding window across a process pool; each task
+        evaluates all min_children values in a single pass over the index.
+        workers=1 runs in-process.
+
+        Returns:
+            One summary row per combination, ordered by (funding_window, min_children)
+        """
+        self._require_index()
+        min_children_values = sorted(set(min_children_values or MIN_CHILDREN_RANGE))
+        funding_window_values = sorted(set(funding_window_values or FUNDING_WINDOW_RANGE))
+        workers = workers or min(len(funding_window_values), os.cpu_count() or 1)
+
+        started = time.monotonic()
+        if workers == 1:
+            batches = [_evaluate_window(w, min_children_values, self.event_index) for w in funding_window_values]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(self.event_index,)
+            ) as executor:
+                batches = list(executor.map(
+                    _evaluate_window, funding_window_values, [min_children_values] * len(funding_window_values)
+                ))
+
+        rows = [row for batch in batches for row in batch]
+        logger.info(f"Evaluated {len(rows)} parameter combinations with {workers} workers "
+                    f"in {time.monotonic() - started:.2f}s")
+        return rows
+
+    def _require_index(self) -> None:
+        if self.event_index is None:
+            raise ValueError("No recording loaded; call load_fixture, load_store or load_transactions first")
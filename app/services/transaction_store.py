@@ -0,0 +1,130 @@
+# app/services/transaction_store.py
+import json
+import logging
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.transaction import BackfillCheckpoint, StoredTransaction, WalletTransaction
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionStore:
+    """
+    Local store of raw Helius transactions and per-wallet backfill progress.
+
+    Transactions are stored once per signature and linked to every wallet
+    whose history returned them.
+    """
+
+    def save_page(
+        self,
+        db: Session,
+        wallet_address: str,
+        transactions: List[Dict[str, Any]],
+        backward: bool = True,
+        completed: bool = False,
+        covered_since: Optional[int] = None,
+        newest_signature: Optional[str] = None,
+    ) -> BackfillCheckpoint:
+        """
+        Store one page of a wallet's history and advance its checkpoint.
+
+        The page and the checkpoint are committed together, so an interrupted
+        backfill never skips a page it has not stored.
+
+        Args:
+            backward: The page continues backwards from last_signature and
+                moves it; pages catching up on newer history leave it alone
+            completed: The page reached the start of the wallet's history
+            covered_since: The page reached this since cutoff
+            newest_signature: Newest signature now stored for the wallet
+        """
+        signatures = [txn["signature"] for txn in transactions if txn.get("signature")]
+
+        if signatures:
+            stored = {
+                row.signature
+                for row in db.query(StoredTransaction.signature).filter(StoredTransaction.signature.in_(signatures))
+            }
+            linked = {
+                row.signature
+                for row in db.query(WalletTransaction.signature).filter(
+                    WalletTransaction.wallet_address == wallet_address,
+                    WalletTransaction.signature.in_(signatures),
+                )
+            }
+            for txn in transactions:
+                signature = txn.get("signature")
+                if not signature:
+                    continue
+                if signature not in stored:
+                    db.add(StoredTransaction(
+                        signature=signature,
+                        timestamp=txn["timestamp"],
+                        slot=txn.get("slot"),
+                        payload=json.dumps(txn),
+                    ))
+                    stored.add(signature)
+                if signature not in linked:
+                    db.add(WalletTransaction(wallet_address=wallet_address, signature=signature))
+                    linked.add(signature)
+
+        checkpoint = self.get_checkpoint(db, wallet_address)
+        if checkpoint is None:
+            checkpoint = BackfillCheckpoint(wallet_address=wallet_address, transactions_fetched=0, pages_fetched=0)
+            db.add(checkpoint)
+        if signatures:
+            if backward:
+                checkpoint.last_signature = signatures[-1]
+                if checkpoint.newest_signature is None:
+                    checkpoint.newest_signature = signatures[0]
+            checkpoint.pages_fetched += 1
+            checkpoint.transactions_fetched += len(transactions)
+        if newest_signature:
+            checkpoint.newest_signature = newest_signature
+        if completed:
+            checkpoint.completed = True
+        if covered_since is not None and (checkpoint.covered_since is None or covered_since < checkpoint.covered_since):
+            checkpoint.covered_since = covered_since
+
+        db.commit()
+        return checkpoint
+
+    def get_checkpoint(self, db: Session, wallet_address: str) -> Optional[BackfillCheckpoint]:
+        return db.query(BackfillCheckpoint).filter(BackfillCheckpoint.wallet_address == wallet_address).first()
+
+    def reset_checkpoint(self, db: Session, wallet_address: str) -> None:
+        """
+        Forget a wallet's progress so the next backfill starts from the newest page.
+        """
+        db.query(BackfillCheckpoint).filter(BackfillCheckpoint.wallet_address == wallet_address).delete()
+        db.commit()
+
+    def load_transactions(
+        self,
+        db: Session,
+        wallet_addresses: Optional[List[str]] = None,
+        start_timestamp: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Load stored transactions, newest first like the Helius API.
+
+        Args:
+            wallet_addresses: Restrict to these wallets' histories (all if None)
+            start_timestamp: Only transactions at or after this unix timestamp
+
+        Returns:
+            Raw transaction dicts, each signature once
+        """
+        query = db.query(StoredTransaction.payload)
+        if wallet_addresses is not None:
+            linked = db.query(WalletTransaction.signature).filter(
+                WalletTransaction.wallet_address.in_(wallet_addresses)
+            )
+            query = query.filter(StoredTransaction.signature.in_(linked))
+        if start_timestamp is not None:
+            query = query.filter(StoredTransaction.timestamp >= start_timestamp)
+        query = query.order_by(StoredTransaction.timestamp.desc())
+        return [json.loads(row.payload) for row in query]
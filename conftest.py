@@ -0,0 +1,32 @@
+# conftest.py
+import os
+import tempfile
+
+# Keep the app (and its lifespan create_all) away from the development app.db
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("DEBUG", "false")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import cluster, transaction, wallet_lease  # noqa: F401  (register tables)
+
+# test_api.py is a manual script against a running server, not a pytest module
+collect_ignore = ["test_api.py"]
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/test.db")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
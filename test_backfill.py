@@ -0,0 +1,171 @@
+# test_backfill.py
+import argparse
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.cli import backfill as backfill_cli
+from app.services.backfill_service import BackfillService
+from app.services.helius_service import HeliusService
+from app.services.helius_standin import HeliusStandIn
+from app.services.transaction_store import TransactionStore
+
+WALLET = "WalletA"
+BASE_TS = 1754000000
+
+
+def history(count, start=0, wallet=WALLET):
+    return [
+        {
+            "signature": f"{wallet}-{n}",
+            "timestamp": BASE_TS + n * 60,
+            "feePayer": wallet,
+            "nativeTransfers": [],
+            "tokenTransfers": [],
+        }
+        for n in range(start, start + count)
+    ]
+
+
+def make_backfill(standin, session_factory, **kwargs):
+    return BackfillService(
+        helius_service=HeliusService(transport=standin.transport()),
+        session_factory=session_factory,
+        page_size=100,
+        max_retries=0,
+        **kwargs,
+    )
+
+
+def stored_signatures(session_factory, wallet=WALLET):
+    db = session_factory()
+    try:
+        return {txn["signature"] for txn in TransactionStore().load_transactions(db, [wallet])}
+    finally:
+        db.close()
+
+
+def test_standin_pages_like_helius():
+    standin = HeliusStandIn(history(5) + history(3, wallet="WalletB"))
+    helius = HeliusService(transport=standin.transport())
+
+    newest = asyncio.run(helius.get_raw_transactions(WALLET, 2))
+    older = asyncio.run(helius.get_raw_transactions(WALLET, 10, before=newest[-1]["signature"]))
+    between = asyncio.run(helius.get_raw_transactions(WALLET, 10, before="WalletA-4", until="WalletA-1"))
+
+    assert [t["signature"] for t in newest] == ["WalletA-4", "WalletA-3"]
+    assert [t["signature"] for t in older] == ["WalletA-2", "WalletA-1", "WalletA-0"]
+    assert [t["signature"] for t in between] == ["WalletA-3", "WalletA-2"]
+
+
+def test_interrupted_backfill_resumes_without_refetching(session_factory):
+    standin = HeliusStandIn(history(350), fail_after=2)
+
+    report = asyncio.run(make_backfill(standin, session_factory).run([WALLET]))
+
+    assert WALLET in report["wallets_failed"]
+    assert len(stored_signatures(session_factory)) == 200
+
+    standin.fail_after = None
+    standin.requests = 0
+    report = asyncio.run(make_backfill(standin, session_factory).run([WALLET]))
+
+    assert report["wallets_failed"] == {}
+    assert report["transactions_fetched"] == 150
+    assert stored_signatures(session_factory) == {t["signature"] for t in history(350)}
+    # One catch-up request for newer transactions, then the two remaining older pages
+    assert standin.requests == 3
+
+
+def test_completed_wallet_picks_up_newer_transactions(session_factory):
+    standin = HeliusStandIn(history(120))
+    asyncio.run(make_backfill(standin, session_factory).run([WALLET]))
+
+    standin.add(history(130, start=120))
+    standin.requests = 0
+    report = asyncio.run(make_backfill(standin, session_factory).run([WALLET]))
+
+    assert report["transactions_fetched"] == 130
+    assert standin.requests == 2  # newer pages only; older history is complete
+    assert len(stored_signatures(session_factory)) == 250
+
+    standin.requests = 0
+    report = asyncio.run(make_backfill(standin, session_factory).run([WALLET]))
+    assert report["transactions_fetched"] == 0
+    assert standin.requests == 1
+
+
+def test_larger_days_window_continues_further_back(session_factory):
+    standin = HeliusStandIn(history(300))
+    recent = datetime.fromtimestamp(BASE_TS + 250 * 60)
+    earlier = datetime.fromtimestamp(BASE_TS + 100 * 60)
+
+    asyncio.run(make_backfill(standin, session_factory, since=recent).run([WALLET]))
+    assert len(stored_signatures(session_factory)) == 50
+
+    standin.requests = 0
+    asyncio.run(make_backfill(standin, session_factory, since=recent).run([WALLET]))
+    assert standin.requests == 1  # already covered; only the catch-up check
+
+    asyncio.run(make_backfill(standin, session_factory, since=earlier).run([WALLET]))
+    assert len(stored_signatures(session_factory)) == 200
+
+
+def test_retryable_errors_are_retried(session_factory):
+    standin = HeliusStandIn(history(10))
+    handle = standin.handle
+    responses = iter([httpx.Response(429, json={"error": "slow down"})])
+
+    def flaky(request):
+        return next(responses, None) or handle(request)
+
+    service = BackfillService(
+        helius_service=HeliusService(transport=httpx.MockTransport(flaky)),
+        session_factory=session_factory,
+        max_retries=2,
+    )
+    service.retry_delay = 0
+    report = asyncio.run(service.run([WALLET]))
+
+    assert report["wallets_failed"] == {}
+    assert report["transactions_fetched"] == 10
+
+
+def test_cli_skips_detection_when_a_wallet_failed(monkeypatch):
+    class FailingBackfill:
+        def __init__(self, **kwargs):
+            pass
+
+        async def run(self, wallets, restart=False):
+            return {
+                "wallets": len(wallets),
+                "wallets_failed": {wallets[0]: "503"},
+                "transactions_fetched": 0,
+                "pages_fetched": 0,
+                "elapsed_seconds": 0.0,
+                "transactions_per_second": 0.0,
+            }
+
+    def fail_detection(*args, **kwargs):
+        pytest.fail("detection must not run when a wallet failed")
+
+    monkeypatch.setattr(backfill_cli, "BackfillService", FailingBackfill)
+    monkeypatch.setattr(HeliusService, "detect_wallet_clusters", fail_detection)
+
+    report = asyncio.run(backfill_cli.run(backfill_cli.parse_args([WALLET])))
+
+    assert "detection" not in report
+
+
+@pytest.mark.parametrize("flag, value", [("--page-size", "101"), ("--page-size", "0"), ("--concurrency", "0")])
+def test_cli_rejects_out_of_range_sizes(flag, value):
+    with pytest.raises(SystemExit):
+        backfill_cli.parse_args([WALLET, flag, value])
+
+
+@pytest.mark.parametrize("kwargs", [{"page_size": 101}, {"page_size": 0}, {"concurrency": 0}])
+def test_service_rejects_out_of_range_sizes(kwargs):
+    with pytest.raises(ValueError):
+        BackfillService(**kwargs)
@@ -0,0 +1,157 @@
+# test_clusters.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.cluster import Cluster
+from app.services.cluster_service import ClusterService
+
+BASE_TIME = datetime(2025, 8, 1, 12, 0, 0)
+
+
+def make_cluster(index, children=6, swapped=3, parent=None, cluster_type="BUY_CLUSTER", amount=None):
+    formation_time = BASE_TIME + timedelta(minutes=index % 7)  # repeated sort values exercise the id tie-break
+    return {
+        "cluster_id": f"P{index}_{int(formation_time.timestamp())}",
+        "parent_wallet": parent or f"P{index}",
+        "formation_time": formation_time.isoformat(),
+        "formation_window": f"{formation_time.isoformat()} - {(formation_time + timedelta(minutes=5)).isoformat()}",
+        "cluster_type": cluster_type,
+        "funding_stats": {
+            "children_funded": children,
+            "total_amount_sent": amount if amount is not None else float(index % 4),
+            "funding_token": "So11111111111111111111111111111111111111112",
+            "funding_token_symbol": "SOL",
+        },
+        "swap_stats": {
+            "children_swapped": swapped,
+            "children_pending": children - swapped,
+            "total_amount_swapped": 1.5,
+            "coordinated_target": True,
+            "target_tokens": ["TOK"],
+        },
+        "children": [
+            {
+                "wallet": f"C{index}_{n}",
+                "funded_amount": 0.1,
+                "swap_status": "completed" if n < swapped else "pending",
+                "swap_amount": 0.5 if n < swapped else 0,
+                "swap_time": formation_time.isoformat() if n < swapped else None,
+                "target_tokens": ["TOK"] if n < swapped else [],
+            }
+            for n in range(children)
+        ],
+    }
+
+
+@pytest.fixture
+def service():
+    return ClusterService()
+
+
+def walk(service, db, **kwargs):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = service.list_clusters(db, cursor=cursor, **kwargs)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort_by", ["formation_time", "total_amount_sent", "children_funded", "swap_completion_rate"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pagination_visits_every_row_once_in_order(service, db, sort_by, order):
+    service.save_clusters(db, [make_cluster(i, children=3 + i % 5, swapped=i % 3) for i in range(23)])
+
+    pages = walk(service, db, sort_by=sort_by, order=order, limit=5)
+    rows = [row for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert len({row["cluster_id"] for row in rows}) == 23
+    keys = [(row[sort_by], row["id"]) for row in rows]
+    assert keys == sorted(keys, reverse=order == "desc")
+
+
+def test_cursor_pagination_applies_filters(service, db):
+    service.save_clusters(db, [
+        make_cluster(i, cluster_type="SELL_CLUSTER" if i % 2 else "BUY_CLUSTER") for i in range(10)
+    ])
+
+    rows = [row for page in walk(service, db, cluster_type="SELL_CLUSTER", limit=2) for row in page]
+
+    assert len(rows) == 5
+    assert {row["cluster_type"] for row in rows} == {"SELL_CLUSTER"}
+
+
+def test_exact_page_boundary_has_no_next_cursor(service, db):
+    service.save_clusters(db, [make_cluster(i) for i in range(4)])
+
+    rows, cursor = service.list_clusters(db, limit=4)
+
+    assert len(rows) == 4
+    assert cursor is None
+
+
+def test_invalid_cursor_and_sort_column_raise_value_error(service, db):
+    with pytest.raises(ValueError):
+        service.list_clusters(db, cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        service.list_clusters(db, sort_by="parent_wallet")
+
+
+def test_save_clusters_updates_existing_rows(service, db):
+    service.save_clusters(db, [make_cluster(1, children=6, swapped=1)])
+    service.save_clusters(db, [make_cluster(1, children=6, swapped=4)])
+
+    detail = service.get_cluster(db, make_cluster(1)["cluster_id"])
+
+    assert db.query(Cluster).count() == 1
+    assert detail["children_swapped"] == 4
+    assert detail["swap_completion_rate"] == pytest.approx(66.7)
+    assert len(detail["children"]) == 6
+
+
+def test_save_clusters_retries_when_another_writer_inserts_first(session_factory):
+    data = make_cluster(1, swapped=2)
+
+    class RacingService(ClusterService):
+        raced = False
+
+        def _load_existing(self, db, cluster_ids):
+            existing = super()._load_existing(db, cluster_ids)
+            if not self.raced:
+                # Another worker commits the same cluster between our select and commit
+                self.raced = True
+                other = session_factory()
+                ClusterService().save_clusters(other, [make_cluster(1, swapped=1)])
+                other.close()
+            return existing
+
+    db = session_factory()
+    RacingService().save_clusters(db, [data])
+
+    assert db.query(Cluster).count() == 1
+    assert ClusterService().get_cluster(db, data["cluster_id"])["children_swapped"] == 2
+    db.close()
+
+
+@pytest.mark.parametrize("sort_by, order", [("children_funded", "desc"), ("formation_time", "asc")])
+def test_cursor_from_another_ordering_is_rejected(service, db, sort_by, order):
+    service.save_clusters(db, [make_cluster(i) for i in range(5)])
+    _, cursor = service.list_clusters(db, sort_by="formation_time", order="desc", limit=2)
+
+    with pytest.raises(ValueError, match="Cursor was issued for"):
+        service.list_clusters(db, sort_by=sort_by, order=order, cursor=cursor)
+
+
+def test_save_without_children_keeps_stored_children(service, db):
+    service.save_clusters(db, [make_cluster(1, children=6, swapped=1)])
+    projected = make_cluster(1, children=6, swapped=3)
+    del projected["children"]
+
+    service.save_clusters(db, [projected])
+    detail = service.get_cluster(db, projected["cluster_id"])
+
+    assert detail["children_swapped"] == 3
+    assert len(detail["children"]) == 6
+    assert not service.cluster_exists(db, "missing")
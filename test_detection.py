@@ -0,0 +1,98 @@
+# test_detection.py
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.helius_service import SOL_MINT, HeliusService
+from app.services.replay_service import ReplayService
+
+BASE_TS = 1754000000
+
+
+def make_transactions(seed, parents=6, transfers=60):
+    rng = random.Random(seed)
+    transactions = []
+    for n in range(transfers):
+        parent = f"P{rng.randrange(parents)}"
+        transactions.append({
+            "signature": f"s{seed}-{n}",
+            "timestamp": BASE_TS + rng.randrange(0, 3600, 20),  # coarse, so timestamps repeat
+            "type": "TRANSFER",
+            "feePayer": parent,
+            "tokenTransfers": [{
+                "fromUserAccount": parent,
+                "toUserAccount": f"C{rng.randrange(25)}",  # children repeat within a window
+                "tokenAmount": 0.1,
+                "mint": SOL_MINT,
+            }],
+        })
+    return sorted(transactions, key=lambda txn: -txn["timestamp"])
+
+
+def reference_first_window(sorted_events, window, min_children):
+    """The original sliding window: restart the scan at every event."""
+    for i in range(len(sorted_events)):
+        window_end = sorted_events[i]["timestamp"] + window
+        children = set()
+        for event in sorted_events[i:]:
+            if event["timestamp"] > window_end:
+                break
+            children.add(event["child"])
+        if len(children) >= min_children:
+            return i
+    return None
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("minutes", [1, 3, 7, 30])
+def test_two_pointer_search_matches_sliding_window(seed, minutes):
+    service = HeliusService()
+    index = service.build_event_index(make_transactions(seed))
+    thresholds = list(range(3, 21))
+    window = timedelta(minutes=minutes)
+
+    for sorted_events, timestamps in index["parents"].values():
+        found = service._first_cluster_windows(sorted_events, timestamps, window, thresholds)
+        for m in thresholds:
+            assert found.get(m) == reference_first_window(sorted_events, window, m)
+
+
+def test_find_clusters_matches_one_call_per_threshold():
+    service = HeliusService()
+    transactions = make_transactions(seed=3, parents=3, transfers=120)
+    index = service.build_event_index(transactions)
+
+    combined = service.find_clusters(index, [3, 5, 8], 10)
+
+    for m in (3, 5, 8):
+        single = service.detect_wallet_clusters(transactions, m, 10)
+        assert combined[m]["clusters"] == single["clusters"]
+        assert combined[m]["summary"] == single["summary"]
+
+
+def test_include_children_false_only_drops_children():
+    service = HeliusService()
+    index = service.build_event_index(make_transactions(seed=5, parents=2, transfers=100))
+
+    full = service.find_clusters(index, [4], 10)[4]
+    light = service.find_clusters(index, [4], 10, include_children=False)[4]
+
+    assert full["clusters"]
+    assert light["summary"] == full["summary"]
+    for light_cluster, full_cluster in zip(light["clusters"], full["clusters"]):
+        assert "children" not in light_cluster
+        assert light_cluster == {k: v for k, v in full_cluster.items() if k != "children"}
+
+
+def test_sweep_rows_match_single_replays():
+    replay = ReplayService()
+    replay.load_transactions(make_transactions(seed=7, parents=3, transfers=150))
+
+    rows = replay.sweep([3, 6], [2, 15], workers=1)
+
+    assert [(r["funding_window_minutes"], r["min_children"]) for r in rows] == [(2, 3), (2, 6), (15, 3), (15, 6)]
+    for row in rows:
+        result = replay.replay(row["min_children"], row["funding_window_minutes"])
+        assert row["clusters_found"] == result["summary"]["clusters_found"]
+        assert row["total_children"] == result["summary"]["total_children"]
@@ -0,0 +1,182 @@
+# test_leases.py
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+
+from app.services.lease_service import DatabaseLeaseBackend, InMemoryLeaseBackend
+from app.services.polling_service import WalletPoller
+
+
+@pytest.fixture(params=["database", "memory"])
+def backend(request, session_factory):
+    if request.param == "database":
+        return DatabaseLeaseBackend(session_factory)
+    return InMemoryLeaseBackend()
+
+
+def test_lease_is_exclusive_until_it_expires(backend):
+    assert backend.acquire("W1", "worker-a", 60)
+    assert not backend.acquire("W1", "worker-b", 60)
+    assert backend.acquire("W1", "worker-a", 60)  # renewal
+    assert backend.get_owner("W1") == "worker-a"
+
+
+def test_expired_lease_is_taken_over(backend):
+    assert backend.acquire("W1", "worker-a", 0.05)
+    time.sleep(0.1)
+
+    assert backend.get_owner("W1") is None
+    assert backend.acquire("W1", "worker-b", 60)
+    assert backend.get_owner("W1") == "worker-b"
+    assert not backend.acquire("W1", "worker-a", 60)
+
+
+def test_release_frees_the_wallet_and_ignores_other_owners(backend):
+    backend.acquire("W1", "worker-a", 60)
+    backend.release("W1", "worker-b")
+    assert backend.get_owner("W1") == "worker-a"
+
+    backend.release("W1", "worker-a")
+    assert backend.get_owner("W1") is None
+    assert backend.acquire("W1", "worker-b", 60)
+
+
+def test_live_owners_skips_expired_leases(backend):
+    backend.acquire("W1", "worker-a", 60)
+    backend.acquire("W2", "worker-b", 0.05)
+    time.sleep(0.1)
+
+    assert backend.live_owners() == {"worker-a"}
+
+
+class FakeHelius:
+    def __init__(self, poll_seconds, log):
+        self.poll_seconds = poll_seconds
+        self.log = log
+
+    async def get_raw_transactions(self, wallet_address, limit):
+        self.log.append(wallet_address)
+        await asyncio.sleep(self.poll_seconds)
+        return []
+
+    def detect_wallet_clusters(self, transactions, min_children, funding_window_minutes):
+        return {"clusters": []}
+
+
+class FakeClusterService:
+    def save_clusters(self, db, clusters):
+        return len(clusters)
+
+
+def make_poller(worker_id, wallets, backend, log, session_factory, poll_seconds=0.0, ttl=60, interval=0.01):
+    poller = WalletPoller(
+        wallets=wallets,
+        lease_backend=backend,
+        worker_id=worker_id,
+        helius_service=FakeHelius(poll_seconds, log),
+        cluster_service=FakeClusterService(),
+        session_factory=session_factory,
+    )
+    poller.lease_ttl = ttl
+    poller.interval = interval
+    return poller
+
+
+def test_slow_rounds_do_not_let_leases_lapse(backend, session_factory):
+    # A round polls 5 wallets x 0.1s, well over the 0.3s TTL; leases must be
+    # renewed independently of poll progress or another worker could take
+    # them over mid-round.
+    wallets = [f"W{i}" for i in range(5)]
+    unowned = []
+
+    async def scenario():
+        poller = make_poller("worker-a", wallets, backend, [], session_factory, poll_seconds=0.1, ttl=0.3)
+        task = asyncio.create_task(poller.run())
+        await asyncio.sleep(0.2)  # first rebalance claims every wallet
+        for _ in range(80):
+            unowned.extend(w for w in wallets if backend.get_owner(w) != "worker-a")
+            await asyncio.sleep(0.02)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert unowned == []
+
+
+def test_wallets_are_spread_when_a_second_worker_joins(backend, session_factory):
+    wallets = [f"W{i}" for i in range(6)]
+    first = make_poller("worker-a", wallets, backend, [], session_factory)
+    second = make_poller("worker-b", wallets, backend, [], session_factory)
+
+    async def scenario():
+        await first.poll_once()
+        assert first._owned == set(wallets)
+
+        await second.poll_once()  # registers, but every wallet is taken
+        await first.poll_once()   # sees two live workers, hands off half
+        await second.poll_once()
+
+    asyncio.run(scenario())
+
+    assert len(first._owned) == 3
+    assert len(second._owned) == 3
+    assert first._owned | second._owned == set(wallets)
+
+
+def test_release_all_lets_another_worker_take_over(backend, session_factory):
+    wallets = ["W1", "W2"]
+    first = make_poller("worker-a", wallets, backend, [], session_factory)
+    second = make_poller("worker-b", wallets, backend, [], session_factory)
+
+    asyncio.run(first.poll_once())
+    first.release_all()
+    polled = asyncio.run(second.poll_once())
+
+    assert sorted(polled) == wallets
+
+
+def test_poller_survives_a_failing_round(session_factory):
+    polled = []
+
+    class FlakyBackend(InMemoryLeaseBackend):
+        failures = 1
+
+        def live_owners(self):
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("database is locked")
+            return super().live_owners()
+
+    backend = FlakyBackend()
+
+    async def scenario():
+        poller = make_poller("worker-a", ["W1"], backend, polled, session_factory)
+        task = asyncio.create_task(poller.run())
+        await asyncio.sleep(0.3)
+        assert not task.done()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert polled  # later rounds still polled after the first one failed
+
+
+def test_locked_database_is_treated_as_not_acquired(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/locked.db", connect_args={"timeout": 0.1})
+    Base.metadata.create_all(bind=engine)
+    backend = DatabaseLeaseBackend(sessionmaker(bind=engine))
+
+    with engine.connect() as locker:
+        locker.exec_driver_sql("BEGIN EXCLUSIVE")
+        assert not backend.acquire("W1", "worker-a", 60)
+        locker.exec_driver_sql("ROLLBACK")
+
+    assert backend.acquire("W1", "worker-a", 60)
+    engine.dispose()
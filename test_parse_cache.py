@@ -0,0 +1,99 @@
+# test_parse_cache.py
+from app.services import helius_service as helius_module
+from app.services.helius_service import HeliusService
+from app.services.parse_cache import ParsedTransactionCache, estimate_size
+
+
+def entry(n):
+    return (({"amount": n, "to": f"C{n}"},), None)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    size = estimate_size(entry(1))
+    cache = ParsedTransactionCache(max_bytes=size * 3)
+    for signature in ("a", "b", "c"):
+        cache.put(signature, entry(1))
+
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("d", entry(1))
+
+    assert "b" not in cache
+    assert all(s in cache for s in ("a", "c", "d"))
+    assert cache.evictions == 1
+
+
+def test_total_size_stays_within_budget():
+    cache = ParsedTransactionCache(max_bytes=estimate_size(entry(1)) * 10)
+    for n in range(100):
+        cache.put(f"sig{n}", entry(n))
+
+    stats = cache.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert len(cache) <= 10
+    assert "sig99" in cache
+
+
+def test_replacing_an_entry_does_not_double_count_its_size():
+    cache = ParsedTransactionCache(max_bytes=10_000)
+    cache.put("a", entry(1))
+    cache.put("a", entry(1))
+
+    assert cache.stats()["bytes"] == estimate_size(entry(1))
+
+
+def test_entry_larger_than_the_budget_is_not_cached():
+    cache = ParsedTransactionCache(max_bytes=estimate_size(entry(1)) - 1)
+    cache.put("a", entry(1))
+
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 0
+
+
+def test_get_or_parse_runs_the_parser_once_per_signature():
+    cache = ParsedTransactionCache(max_bytes=10_000)
+    calls = []
+
+    def parser(txn):
+        calls.append(txn.get("signature"))
+        return entry(len(calls))
+
+    first = cache.get_or_parse({"signature": "a"}, parser)
+    second = cache.get_or_parse({"signature": "a"}, parser)
+    cache.get_or_parse({}, parser)
+    cache.get_or_parse({}, parser)
+
+    assert first is second
+    assert calls == ["a", None, None]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_event_index_skips_duplicate_signatures():
+    transactions = [
+        {"signature": "a", "timestamp": 1},
+        {"signature": "a", "timestamp": 1},
+        {"signature": "b", "timestamp": 2},
+    ]
+
+    index = HeliusService().build_event_index(transactions)
+
+    assert index["total_transactions_analyzed"] == 2
+    assert index["duplicate_transactions_skipped"] == 1
+
+
+def test_size_estimate_counts_events():
+    swap = {"wallet": "C1"}
+
+    assert estimate_size(((), None)) < estimate_size(entry(1)) < estimate_size((entry(1)[0] * 2, None))
+    assert estimate_size((entry(1)[0], swap)) > estimate_size(entry(1))
+
+
+def test_bulk_index_bypasses_the_shared_cache(monkeypatch):
+    cache = ParsedTransactionCache(max_bytes=10_000)
+    monkeypatch.setattr(helius_module, "parse_cache", cache)
+    transactions = [{"signature": "a", "timestamp": 1}, {"signature": "b", "timestamp": 2}]
+
+    HeliusService().build_event_index(transactions, use_cache=False)
+    assert len(cache) == 0
+
+    HeliusService().build_event_index(transactions)
+    assert len(cache) == 2
@@ -0,0 +1,144 @@
+# test_wallets.py
+import json
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import wallets
+from app.core import compression
+from app.core.database import get_db
+from app.main import app
+from app.services.helius_service import HeliusService
+from app.services.helius_standin import HeliusStandIn
+
+RECORDING = "app/reponse.json"
+PARENT = json.load(open(RECORDING))[0]["feePayer"]
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    standin = HeliusStandIn.from_file(RECORDING)
+    monkeypatch.setattr(wallets, "helius_service", HeliusService(transport=standin.transport()))
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_projected_detection_still_persists_children(client):
+    response = client.get(
+        f"/api/v1/wallets/cluster-detection/{PARENT}",
+        params={"min_children": 3, "fields": "clusters", "include_children": "false"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"clusters"}
+    cluster = body["clusters"][0]
+    assert "children" not in cluster
+
+    detail = client.get(f"/api/v1/clusters/{cluster['cluster_id']}").json()
+    assert len(detail["children"]) == cluster["funding_stats"]["children_funded"]
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get(f"/api/v1/wallets/cluster-detection/{PARENT}", params={"fields": "clusters,nope"})
+
+    assert response.status_code == 400
+
+
+def test_unchanged_result_answers_304(client):
+    url = f"/api/v1/wallets/cluster-detection/{PARENT}"
+    first = client.get(url, params={"min_children": 3})
+    etag = first.headers["etag"]
+
+    cached = client.get(url, params={"min_children": 3}, headers={"If-None-Match": etag})
+    other_params = client.get(url, params={"min_children": 4}, headers={"If-None-Match": etag})
+
+    assert etag.startswith('W/"')
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert other_params.status_code == 200
+    assert other_params.headers["etag"] != etag
+
+
+def test_raw_transactions_projection_and_etag(client):
+    url = f"/api/v1/wallets/raw-transactions/{PARENT}"
+    response = client.get(url, params={"fields": "signature,timestamp"})
+
+    assert response.status_code == 200
+    assert all(set(txn) == {"signature", "timestamp"} for txn in response.json()["transactions"])
+    assert client.get(url, params={"fields": "signature,timestamp"},
+                      headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+
+
+def test_large_responses_are_gzipped(client):
+    response = client.get(f"/api/v1/wallets/raw-transactions/{PARENT}", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["transactions"]  # decoded transparently by the client
+
+
+def test_small_and_unaccepted_responses_are_not_compressed(client):
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    identity = client.get(f"/api/v1/wallets/raw-transactions/{PARENT}", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in identity.headers
+
+
+def test_choose_encoding_honours_quality_values(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert compression.choose_encoding("gzip, deflate") == "gzip"
+    assert compression.choose_encoding("gzip;q=0") is None
+    assert compression.choose_encoding("br") is None
+    assert compression.choose_encoding("*") == "gzip"
+
+    monkeypatch.setattr(compression, "brotli", types.SimpleNamespace(compress=lambda body, quality: body))
+    assert compression.choose_encoding("gzip, br") == "br"
+    assert compression.choose_encoding("gzip, br;q=0") == "gzip"
+
+
+def test_gzip_body_round_trips():
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"x" * 4096})
+
+    client = TestClient(compression.CompressionMiddleware(endpoint, minimum_size=1024))
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 4096
+    assert response.content == b"x" * 4096
+
+
+def test_projected_detection_builds_children_only_for_new_clusters(client, monkeypatch):
+    built = []
+    analyze = HeliusService._analyze_cluster
+
+    def recording_analyze(self, *args, **kwargs):
+        cluster = analyze(self, *args, **kwargs)
+        built.append("children" in cluster)
+        return cluster
+
+    monkeypatch.setattr(HeliusService, "_analyze_cluster", recording_analyze)
+    url = f"/api/v1/wallets/cluster-detection/{PARENT}"
+
+    client.get(url, params={"min_children": 3, "fields": "summary"})
+    assert built and all(built)  # first sighting: children built for the stored rows
+
+    built.clear()
+    body = client.get(url, params={"min_children": 3, "fields": "summary,clusters", "include_children": "false"}).json()
+    assert built and not any(built)  # already stored: never built
+
+    cluster_id = body["clusters"][0]["cluster_id"]
+    detail = client.get(f"/api/v1/clusters/{cluster_id}").json()
+    assert len(detail["children"]) == body["clusters"][0]["funding_stats"]["children_funded"]